@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 import webview
 import ctypes
 import logging
@@ -71,4 +72,6 @@ def main():
     webview.start(debug=not getattr(sys, 'frozen', False))
 
 if __name__ == '__main__':
+    # icon extraction runs on a process pool; frozen builds need this to spawn workers
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+# Compares the plain zipfile.write loop BackupService used before with ParallelZipWriter.
+# Run from the repo root: python benchmarks/bench_parallel_zip.py [total MiB] [files]
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.parallel_zip import ParallelZipWriter
+
+
+def make_saves(root: Path, total_mb: int, count: int):
+    # half random, half repetitive: roughly how save folders compress
+    size = total_mb * 1024 * 1024 // count
+    files = []
+    for i in range(count):
+        path = root / f"save_{i}.sav"
+        with open(path, "wb") as f:
+            for _ in range(0, size, 64 * 1024):
+                f.write(os.urandom(32 * 1024) + bytes([i % 256]) * (32 * 1024))
+        files.append((path, path.name))
+    return files
+
+
+def bench(name: str, archive: Path, write, repeat: int = 3):
+    # best of a few runs, so page cache and pool start-up don't decide the result
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zipf:
+            write(zipf)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.testzip() is None
+    print(f"{name:<24}{elapsed:8.2f} s{archive.stat().st_size / 1024 / 1024:10.1f} MiB")
+    return elapsed
+
+
+def main():
+    total_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        source = root / "saves"
+        source.mkdir()
+        files = make_saves(source, total_mb, count)
+        print(f"{count} files, {total_mb} MiB, {os.cpu_count()} cpus")
+
+        def sequential(zipf):
+            for path, arc_name in files:
+                zipf.write(path, arc_name, compresslevel=6)
+
+        baseline = bench("zipfile.write", root / "sequential.zip", sequential)
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            elapsed = bench(f"ParallelZipWriter x{workers}", root / f"parallel{workers}.zip",
+                            lambda zipf: ParallelZipWriter(zipf, 6, workers).add_files(files))
+            print(f"{'':<24}{baseline / elapsed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
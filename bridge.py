@@ -8,12 +8,16 @@ import json
 import logging
 
 from core.backup_service import BackupService
+from core.event_channel import EventChannel
+from core.download_manager import DownloadManager
 from core.file_utils import FileUtils
 from core.launcher import LauncherService
 from core.updater import UpdaterService
 
 class Bridge:
     VERSION = "0.0.8"
+    STREAM_BATCH_SIZE = 25
+    STREAM_BATCH_INTERVAL = 0.1
     
     def __init__(self):
         from core.config import ConfigService
@@ -21,23 +25,45 @@ class Bridge:
         from core.scanner import GameScanner
         from core.steam import SteamService
         from core.cache_service import CacheService
+        from core.library_service import LibraryService
+        from core.prefetch_service import PrefetchService
+        from core.icon_service import IconService
+        from core.news_service import NewsService
+        from core.backup_catalog import BackupCatalog
 
         self._config = ConfigService()
-        self._cache = CacheService()
+        self._cache = CacheService(self._config.get("image_cache_mb", 64) * 1024 * 1024)
+        self._cache.start_server()
         self._steam = SteamService()
+        self._news = NewsService(self._steam, self._push_news, self._config.get("news_ttl", NewsService.DEFAULT_TTL))
+        self._downloads = DownloadManager(self._cache.save_from_url, self._config.get("download_workers", DownloadManager.DEFAULT_WORKERS))
+        self._icons = IconService(self._config.get("icon_workers", IconService.DEFAULT_WORKERS))
+        self._prefetch = PrefetchService(
+            self._cache, self._steam, self._downloads,
+            rate=self._config.get("prefetch_rate", PrefetchService.DEFAULT_RATE),
+            max_in_flight=self._config.get("prefetch_concurrency", PrefetchService.DEFAULT_MAX_IN_FLIGHT)
+        )
         self._resolver = PathResolver(self._steam)
         self._scanner = GameScanner(self._steam, self._config, self._resolver)
+        self._library = LibraryService(self._scanner)
+        self._catalog = BackupCatalog()
+        # catches archives copied in or deleted while the app was closed
+        threading.Thread(target=self._catalog.reconcile, args=(self._config.get("backup_root"),), daemon=True).start()
+        self._cached_games = []
         self._window = None
+        self._events = EventChannel()
         self._is_maximized = False
         
         self._launcher = None
+        self._update_info = {}
     
     def get_app_version(self):
         return self.VERSION
     
     def check_updates(self):
         try:
-            return UpdaterService.check_for_updates(self.VERSION)
+            self._update_info = UpdaterService.check_for_updates(self.VERSION)
+            return self._update_info
         except Exception as e:
             print(f"Ошибка проверки обновления: {e}")
             return {
@@ -52,20 +78,25 @@ class Bridge:
         def progress(percent):
             currect_percent = int(percent)
             logging.debug(f"Download progress: {currect_percent}%")
-            self._window.evaluate_js(f"UI.updateDownloadProgress({currect_percent})")
+            self._events.emit(f"UI.updateDownloadProgress({currect_percent})", key="update_progress")
         
         def run_process():
             try:
-                success = UpdaterService.install_update(url, progress)
+                # verify against the release we announced, if this is its installer
+                info = self._update_info if self._update_info.get("download_url") == url else {}
+                success = UpdaterService.install_update(url, progress, info.get("sha256"), info.get("size"))
                 if success:
                     logging.info("Update installed, exiting...")
+                    # os._exit skips atexit, so write out anything still debounced first
+                    self._config.flush()
+                    self._events.flush()
                     os._exit(0)
                 else:
                     logging.error("Update failed in UpdaterService")
-                    self._window.evaluate_js(f"UI.resetUpdateUI('Ошибка при запуске обновления')")
+                    self._events.emit(f"UI.resetUpdateUI({json.dumps('Ошибка при запуске обновления')})")
             except Exception as e:
                 logging.exception("Exception in update thread:")
-                self._window.evaluate_js(f"UI.resetUpdateUI('Ошибка: {str(e)}')")
+                self._events.emit(f"UI.resetUpdateUI({json.dumps(f'Ошибка: {e}')})")
                   
         thread = threading.Thread(target=run_process, daemon=True)
         thread.start()
@@ -90,12 +121,14 @@ class Bridge:
     
     def set_window(self, window):
         self._window = window
-        self._launcher = LauncherService(window)
+        self._events.attach(window)
+        self._launcher = LauncherService(self._events)
         
     def get_maximize_status(self):
         return self._is_maximized
     
     def close_window(self):
+        self._config.flush()
         self._window.destroy()
         sys.exit()
 
@@ -108,31 +141,24 @@ class Bridge:
     
     def get_dashboard_data(self):
         backup_root = self._config.get("backup_root")
-        games = self._scanner.scan_all()
+        # the snapshot, not a refresh: a rescan streaming in holds the library lock until
+        # its last root is done, and the loader stays up until this returns
+        games = self._library.get_cached_games()
         
-        total_size_bytes = 0
-        all_backups = []
-        
-        path = Path(backup_root)
-        if path.exists():
-            for file in path.rglob('*.zip'):
-                stats = file.stat()
-                total_size_bytes += stats.st_size
-                all_backups.append({
-                    "name": file.name,
-                    "game": file.parent.name,
-                    "size": FileUtils.format_size(stats.st_size),
-                    "date": stats.st_mtime
-                })
-
-        recent_activity = sorted(all_backups, key=lambda x: x['date'], reverse=True)[:5]
+        self._catalog.ensure(backup_root)
+        _, total_size_bytes = self._catalog.get_totals(backup_root)
+        recent_activity = self._catalog.get_recent(backup_root, 5)
+
+        # warm news for the games the carousel shows first, so opening one doesn't wait
+        self._news.prefetch([g.get('steam_id') for g in games], self._config.get("news_prefetch", self._news.DEFAULT_PREFETCH))
 
         carousel_games = []
         for g in games:
             carousel_games.append({
                 "id": g['id'],
                 "steam_id": g.get('steam_id'),
-                "name": g['name']
+                "name": g['name'],
+                "thumb": self._cache.get_url('hero', str(g['id']), 'thumb', fallback=False)
             })
 
         try:
@@ -150,27 +176,33 @@ class Bridge:
     
     # Backup Logic
     def start_backup(self, game_id: str):
-        games = self._scanner.scan_all()
-        game = next((g for g in games if str(g['id']) == str(game_id)), None)
+        game = self._library.get_game(game_id)
         
         if not game or not game['save_paths']:
             return {"status": "error", "message": "Paths not found"}
 
-        def on_progress(percent):
-            self._window.evaluate_js(f"UI.updateUIProgress({percent})")
+        def on_progress(stats):
+            self._events.emit(f"UI.updateUIProgress({stats['percent']}, {json.dumps(stats)})", key="backup_progress")
 
         def worker():
             try:
+                backup_root = self._config.get("backup_root")
                 result_path = BackupService.create_zip(
                     game['name'],
                     game['save_paths'],
-                    self._config.get("backup_root"),
-                    on_progress
+                    backup_root,
+                    on_progress,
+                    incremental=self._config.get("incremental_backups", False),
+                    compression_level=self._config.get("backup_compression_level", BackupService.DEFAULT_LEVEL),
+                    workers=self._config.get("backup_workers")
                 )
-                self._window.evaluate_js(f"UI.onBackupComplete('{result_path}')")
+                if result_path.endswith(".zip"):
+                    self._catalog.add(backup_root, result_path)
+                # paths carry apostrophes ("Baldur's Gate 3") and backslashes, so encode them
+                self._events.emit(f"UI.onBackupComplete({json.dumps(result_path)})")
             except Exception as e:
                 error_msg = json.dumps(str(e))
-                self._window.evaluate_js(f"UI.onBackupComplete({error_msg})")
+                self._events.emit(f"UI.onBackupComplete({error_msg})")
 
         threading.Thread(target=worker, daemon=True).start()
         return {"status": "started"}
@@ -195,23 +227,67 @@ class Bridge:
         
         return False
     
+    def _with_icon(self, game: dict) -> dict:
+        # copy: local_icon must not leak into the persisted snapshot
+        game = dict(game)
+        icon_url = self._cache.get_url('icon', str(game['id']))
+        if icon_url:
+            game['local_icon'] = icon_url
+        return game
+
     def get_games(self):
-        self._cached_games = self._scanner.scan_all()
-        
-        for game in self._cached_games:
-            game_id = str(game['id'])
-            b64_icon = self._cache.get_base64('icon', game_id)
-            if b64_icon:
-                game['local_icon'] = b64_icon
+        self._cached_games = [self._with_icon(g) for g in self._library.get_games()]
         
         threading.Thread(target=self._load_missing_icons_async, daemon=True).start()
+        self._start_prefetch(self._cached_games)
         
         return self._cached_games
+
+    def stream_games(self, force: bool = False):
+        # returns the last snapshot right away, then pushes rescanned games in batches;
+        # force rescans every root instead of only the ones whose fingerprint changed
+        self._cached_games = [self._with_icon(g) for g in self._library.get_cached_games()]
+        threading.Thread(target=self._stream_games_worker, args=(force,), daemon=True).start()
+        return self._cached_games
+
+    def _push_games(self, batch):
+        if batch:
+            self._events.emit(f"UI.addGames({json.dumps(batch)})")
+
+    def _stream_games_worker(self, force: bool = False):
+        batch = []
+        last_flush = time.monotonic()
+        try:
+            for game in self._library.iter_refresh(force):
+                batch.append(self._with_icon(game))
+                if len(batch) >= self.STREAM_BATCH_SIZE or time.monotonic() - last_flush > self.STREAM_BATCH_INTERVAL:
+                    self._push_games(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+            self._push_games(batch)
+        except Exception:
+            logging.exception("Library stream failed:")
+
+        games = self._library.get_cached_games()
+        self._cached_games = [self._with_icon(g) for g in games]
+        ids = json.dumps([str(g['id']) for g in games])
+        self._events.emit(f"UI.finishGamesStream({ids})")
+
+        self._start_prefetch(games)
+        self._load_missing_icons_async()
+
+    def _start_prefetch(self, games):
+        if not self._config.get("prefetch_artwork", True): return
+
+        def on_progress(done, total):
+            self._events.emit(f"UI.updatePrefetchProgress({done}, {total})", key="prefetch_progress")
+
+        self._prefetch.start(games, on_progress)
     
     def get_game_assets(self, game_id: str, steam_id: str):
         print(f"[Bridge] requesting assets for Game: {game_id}, SteamID: {steam_id}")
-        hero_result = self._cache.get_base64('hero', game_id)
-        logo_result = self._cache.get_base64('logo', game_id)
+        hero_result = self._cache.get_url('hero', game_id, 'large')
+        logo_result = self._cache.get_url('logo', game_id, 'large')
 
         hero_url = ""
         logo_url = ""
@@ -219,14 +295,18 @@ class Bridge:
         if steam_id and str(steam_id) != "None":
             hero_url = self._steam.get_hero_url(steam_id)
             logo_url = self._steam.get_logo_url(steam_id)
+
+        # known 404s: don't hand the webview a url that is going to fail again
+        if hero_url and self._cache.is_known_missing(hero_url): hero_url = ""
+        if logo_url and self._cache.is_known_missing(logo_url): logo_url = ""
         
         if not hero_result and hero_url:
             hero_result = hero_url
-            threading.Thread(target=self._download_single_asset, args=('hero', game_id, hero_url), daemon=True).start()
+            self._download_single_asset('hero', game_id, hero_url)
         
         if not logo_result and logo_url:
             logo_result = logo_url
-            threading.Thread(target=self._download_single_asset, args=('logo', game_id, logo_url), daemon=True).start()
+            self._download_single_asset('logo', game_id, logo_url)
             
         return {
             "hero": hero_result,
@@ -234,31 +314,37 @@ class Bridge:
         }
     
     def get_game_news(self, steam_id: str):
-        return self._steam.get_game_news(steam_id)
+        return self._news.get(steam_id)
+
+    def _push_news(self, steam_id, items):
+        self._events.emit(f"UI.updateGameNews({json.dumps(str(steam_id))}, {json.dumps(items)})", key=f"news:{steam_id}")
     
-    def _download_single_asset(self, category, game_id, url):
-        if not self._cache.has_cached(category, game_id):
-            print(f"[Cache] Background downloading {category} for {game_id}...")
-            self._cache.save_from_url(category, game_id, url)
+    def _download_single_asset(self, category, game_id, url, priority=DownloadManager.PRIORITY_VISIBLE):
+        if self._cache.has_cached(category, game_id): return
+
+        print(f"[Cache] Background downloading {category} for {game_id}...")
+        future = self._downloads.submit(category, game_id, url, priority)
+
+        def on_done(f):
+            if f.result():
+                asset_url = self._cache.get_url(category, game_id, 'large')
+                self._events.emit(f"UI.updateGameAsset({json.dumps(str(game_id))}, {json.dumps(category)}, {json.dumps(asset_url)})", key=f"{category}:{game_id}")
+
+        future.add_done_callback(on_done)
+        return future
                     
     def _load_missing_icons_async(self):
         games_to_scan = list(self._cached_games)
 
-        for game in games_to_scan:
-            game_id = str(game['id'])
-            
-            if not self._cache.has_cached('icon', game_id):
-                icon_bytes = self._scanner.extract_icon_manually(game['install_path'])
-                
-                if icon_bytes:
-                    self._cache.save_icon_bytes(game_id, icon_bytes)
-                    b64_str = self._cache.get_base64('icon', game_id)
-                    
-                    time.sleep(0.05)
-                    self._window.evaluate_js(f"UI.updateListIcon('{game_id}', '{b64_str}')")
+        def on_icon(game_id, icon_bytes):
+            self._cache.save_icon_bytes(game_id, icon_bytes)
+            icon_url = self._cache.get_url('icon', game_id)
+            self._events.emit(f"UI.updateListIcon({json.dumps(str(game_id))}, {json.dumps(icon_url)})", key=f"icon:{game_id}")
+
+        self._icons.extract_missing(games_to_scan, lambda game_id: self._cache.has_cached('icon', game_id), on_icon)
     
     def _load_icons_async(self):
-        icon_cache = self._config.get("icon_cache", {})
+        icon_cache = self._config.get_icon_cache()
         
         for game in self._cached_games:
             game_id = str(game['id'])
@@ -272,19 +358,20 @@ class Bridge:
                     icon_cache[game_id] = icon_data
 
             if icon_data:
-                self._window.evaluate_js(f"UI.updateListIcon('{game_id}', '{icon_data}')")
+                self._events.emit(f"UI.updateListIcon({json.dumps(game_id)}, {json.dumps(icon_data)})", key=f"icon:{game_id}")
         
-        self._config.set("icon_cache", icon_cache)
+        self._config.save_icon_cache(icon_cache)
                 
     def get_game_details(self, game_id: str):
-        games = self._scanner.scan_all()
-        game = next((g for g in games if str(g['id']) == str(game_id)), None)
+        game = self._library.get_game(game_id)
         
         if not game: return None
 
         from core.file_utils import FileUtils
         size_bytes = FileUtils.get_folder_size(game['save_paths'])
-        backups = FileUtils.get_backups_list(self._config.get("backup_root"), game['name'])
+        backup_root = self._config.get("backup_root")
+        self._catalog.ensure(backup_root)
+        backups = self._catalog.get_game_backups(backup_root, game['name'])
 
         return {
             "size": FileUtils.format_size(size_bytes),
@@ -307,11 +394,25 @@ class Bridge:
             path = Path(file_path)
             if path.exists() and path.suffix == '.zip':
                 path.unlink()
+                self._catalog.remove(str(path))
+                BackupService.prune_store(str(path.parent))
                 return True
         except Exception as e:
             print(f"Delete error: {e}")
         return False
     
+    def restore_backup(self, file_path: str, game_id: str = None):
+        try:
+            # backups made before manifests existed are put back next to the game's save paths
+            game = self._library.get_game(game_id) if game_id else None
+            count = BackupService.restore(file_path, save_paths=game['save_paths'] if game else None)
+            # restored files are often rewritten in place, which a directory mtime won't show
+            FileUtils.clear_size_cache()
+            return {"status": "ok", "files": count}
+        except Exception as e:
+            logging.exception("Restore failed:")
+            return {"status": "error", "message": str(e)}
+
     def remove_folder(self, path: str):
         current = self._config.get("non_steam_paths", [])
         target_path = os.path.normpath(path)
@@ -333,7 +434,7 @@ class Bridge:
         }
 
     def play_game(self, game_id: str):
-        game = next((g for g in self._cached_games if str(g['id']) == str(game_id)), None)
+        game = self._library.get_game(game_id)
         if game:
             return self._launcher.launch(game)
         return False
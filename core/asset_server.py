@@ -0,0 +1,92 @@
+import shutil
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Optional
+from pathlib import Path
+from urllib.parse import urlsplit, unquote
+
+class AssetServer:
+    MIME_TYPES = {
+        ".png": "image/png",
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".webp": "image/webp"
+    }
+
+    def __init__(self, resolve: Callable[[str, str], Optional[Path]], host: str = "127.0.0.1", port: int = 0):
+        # resolve(category, game_id) -> file path, or None for anything we don't serve
+        self.resolve = resolve
+        self.host = host
+        self.port = port
+        self._httpd = None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        if not self._httpd: return None
+        return f"http://{self.host}:{self._httpd.server_address[1]}"
+
+    def start(self) -> bool:
+        if self._httpd: return True
+        try:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+            self._httpd.daemon_threads = True
+        except OSError as e:
+            print(f"[AssetServer] Cannot start: {e}")
+            return False
+
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        print(f"[AssetServer] Serving cache at {self.base_url}")
+        return True
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    @staticmethod
+    def etag(path: Path) -> str:
+        stats = path.stat()
+        return f'"{stats.st_mtime_ns:x}-{stats.st_size:x}"'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._serve(with_body=True)
+
+            def do_HEAD(self):
+                self._serve(with_body=False)
+
+            def _serve(self, with_body: bool):
+                parts = unquote(urlsplit(self.path).path).strip("/").split("/")
+                path = server.resolve(parts[0], parts[1]) if len(parts) == 2 else None
+
+                if not path or not path.is_file():
+                    self.send_error(404)
+                    return
+
+                etag = server.etag(path)
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", server.MIME_TYPES.get(path.suffix.lower(), "application/octet-stream"))
+                self.send_header("Content-Length", str(path.stat().st_size))
+                self.send_header("ETag", etag)
+                # urls carry ?v=<mtime>, so a given url never changes content
+                self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+                self.end_headers()
+
+                if with_body:
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, self.wfile)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
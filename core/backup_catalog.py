@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from core.file_utils import FileUtils
+
+class BackupCatalog:
+    # one row per backup archive, so the dashboard and game view answer from an
+    # indexed table instead of walking and stat-ing backup_root on every open
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or FileUtils.get_app_data_dir() / "backups.db"
+        self._lock = threading.Lock()
+        self._reconciled = set()
+
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS backups (
+                    path TEXT PRIMARY KEY,
+                    root TEXT NOT NULL,
+                    game TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS backups_root_mtime ON backups (root, mtime);
+                CREATE INDEX IF NOT EXISTS backups_root_game ON backups (root, game, mtime);
+                CREATE TABLE IF NOT EXISTS roots (root TEXT PRIMARY KEY);
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    @staticmethod
+    def _row(root: str, file: Path, stats: os.stat_result) -> tuple:
+        return (BackupCatalog._key(file), root, file.parent.name, file.name, stats.st_size, stats.st_mtime)
+
+    def add(self, backup_root: str, file_path: str):
+        file = Path(file_path)
+        try:
+            stats = file.stat()
+        except OSError:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?, ?)",
+                         self._row(self._key(backup_root), file, stats))
+
+    def remove(self, file_path: str):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM backups WHERE path = ?", (self._key(file_path),))
+
+    def ensure(self, backup_root: str):
+        # a root we've never catalogued is walked once up front; after that the
+        # catalog is trusted and reconcile() runs in the background
+        root = self._key(backup_root)
+        if root in self._reconciled: return
+        with self._connect() as conn:
+            known = conn.execute("SELECT 1 FROM roots WHERE root = ?", (root,)).fetchone()
+        if known:
+            self._reconciled.add(root)
+        else:
+            self.reconcile(backup_root)
+
+    def reconcile(self, backup_root: str) -> Tuple[int, int]:
+        # picks up archives added, changed or removed outside the app; returns (upserted, removed)
+        root = self._key(backup_root)
+        found: Dict[str, tuple] = {}
+
+        path = Path(backup_root)
+        if path.exists():
+            # backups sit at <root>/<game>/*.zip; .store holds incremental objects
+            for game_dir in path.iterdir():
+                if not game_dir.is_dir() or game_dir.name.startswith("."): continue
+                for file in game_dir.glob("*.zip"):
+                    try:
+                        row = self._row(root, file, file.stat())
+                    except OSError:
+                        continue
+                    found[row[0]] = row
+
+        with self._lock, self._connect() as conn:
+            known = {r["path"]: (r["size"], r["mtime"]) for r in
+                     conn.execute("SELECT path, size, mtime FROM backups WHERE root = ?", (root,))}
+
+            changed = [row for key, row in found.items() if known.get(key) != (row[4], row[5])]
+            gone = [(key,) for key in known if key not in found]
+
+            conn.executemany("INSERT OR REPLACE INTO backups VALUES (?, ?, ?, ?, ?, ?)", changed)
+            conn.executemany("DELETE FROM backups WHERE path = ?", gone)
+            conn.execute("INSERT OR IGNORE INTO roots VALUES (?)", (root,))
+
+        self._reconciled.add(root)
+        if changed or gone:
+            print(f"[Catalog] Reconciled {backup_root}: {len(changed)} updated, {len(gone)} removed")
+        return len(changed), len(gone)
+
+    def get_totals(self, backup_root: str) -> Tuple[int, int]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM backups WHERE root = ?",
+                               (self._key(backup_root),)).fetchone()
+        return row[0], row[1]
+
+    def get_recent(self, backup_root: str, limit: int = 5) -> List[dict]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM backups WHERE root = ? ORDER BY mtime DESC LIMIT ?",
+                                (self._key(backup_root), limit)).fetchall()
+        return [{
+            "name": r["name"],
+            "game": r["game"],
+            "size": FileUtils.format_size(r["size"]),
+            "date": r["mtime"]
+        } for r in rows]
+
+    def get_game_backups(self, backup_root: str, game_name: str) -> List[dict]:
+        game = FileUtils.sanitize_name(game_name)
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM backups WHERE root = ? AND game = ? ORDER BY mtime DESC",
+                                (self._key(backup_root), game)).fetchall()
+        return [{
+            "name": r["name"],
+            "path": str(Path(backup_root) / r["game"] / r["name"]),
+            "size": FileUtils.format_size(r["size"]),
+            "date": r["mtime"]
+        } for r in rows]
@@ -1,22 +1,25 @@
 import zipfile
 import datetime
+import hashlib
+import json
+import os
+import shutil
+import zlib
 from pathlib import Path
-from typing import List, Callable
+from typing import List, Callable, Optional
 
 from core.file_utils import FileUtils
+from core.parallel_zip import ParallelZipWriter
+from core.progress import ProgressTracker
 
 class BackupService:
-    @staticmethod
-    def create_zip(game_name: str, source_paths: List[str], destination_root: str, progress_callback: Callable[[float], None]) -> str:
-        safe_name = FileUtils.sanitize_name(game_name)
-        
-        dest_dir = Path(destination_root) / safe_name
-        dest_dir.mkdir(parents=True, exist_ok=True)
-
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        zip_name = f"{safe_name}_{timestamp}.zip" # ИСПОЛЬЗУЕМ safe_name
-        zip_path = dest_dir / zip_name
+    MANIFEST_NAME = ".gamevault/manifest.json"
+    STORE_DIR = ".store"
+    HASH_CHUNK = 1024 * 1024
+    DEFAULT_LEVEL = 6
 
+    @staticmethod
+    def _collect_files(source_paths: List[str]) -> list:
         files_to_add = []
         for path_str in source_paths:
             p = Path(path_str)
@@ -27,16 +30,271 @@ class BackupService:
                     for file in p.rglob('*'):
                         if file.is_file():
                             files_to_add.append((file, file.relative_to(p.parent)))
+        return files_to_add
+
+    @staticmethod
+    def create_zip(game_name: str, source_paths: List[str], destination_root: str, progress_callback: Callable[[dict], None], incremental: bool = False, compression_level: int = DEFAULT_LEVEL, workers: Optional[int] = None) -> str:
+        safe_name = FileUtils.sanitize_name(game_name)
+
+        dest_dir = Path(destination_root) / safe_name
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        zip_name = f"{safe_name}_{timestamp}.zip" # ИСПОЛЬЗУЕМ safe_name
+        zip_path = dest_dir / zip_name
+        suffix = 1
+        while zip_path.exists():
+            zip_path = dest_dir / f"{safe_name}_{timestamp}_{suffix}.zip"
+            suffix += 1
+
+        files_to_add = BackupService._collect_files(source_paths)
 
         if not files_to_add:
             return "No files found"
 
-        total_files = len(files_to_add)
-        
+        if incremental:
+            return BackupService._create_incremental(game_name, files_to_add, dest_dir, zip_path, progress_callback, compression_level)
+
+        manifest = BackupService._new_manifest(game_name, incremental=False)
+
+        for file_path, arc_name in files_to_add:
+            manifest["files"].append(BackupService._manifest_entry(file_path, arc_name))
+
+        progress = ProgressTracker(sum(e["size"] for e in manifest["files"]), progress_callback)
+
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            writer = ParallelZipWriter(zipf, level=compression_level, workers=workers)
+            writer.add_files(files_to_add, progress.advance)
+            zipf.writestr(BackupService.MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
+
+        progress.finish()
+        return str(zip_path)
+
+    # Incremental backups
+    # Every incremental backup is a zip holding only a manifest. File contents live once
+    # in <game>/.store/objects, addressed by sha256, so unchanged files cost nothing.
+
+    @staticmethod
+    def _new_manifest(game_name: str, incremental: bool) -> dict:
+        return {
+            "version": 1,
+            "game": game_name,
+            "created": datetime.datetime.now().timestamp(),
+            "incremental": incremental,
+            "files": []
+        }
+
+    @staticmethod
+    def _manifest_entry(file_path: Path, arc_name, sha256: Optional[str] = None) -> dict:
+        stats = file_path.stat()
+        return {
+            "arcname": Path(arc_name).as_posix(),
+            "source": str(file_path),
+            "size": stats.st_size,
+            "mtime": stats.st_mtime,
+            "sha256": sha256
+        }
+
+    @staticmethod
+    def _object_path(store: Path, digest: str) -> Path:
+        return store / "objects" / digest[:2] / digest
+
+    @staticmethod
+    def _store_file(file_path: Path, store: Path, level: int = DEFAULT_LEVEL, on_bytes: Optional[Callable[[int], None]] = None) -> str:
+        # hash and compress in one pass, then move the blob into place if it is new
+        tmp_dir = store / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{os.getpid()}_{file_path.name}.part"
+
+        hasher = hashlib.sha256()
+        compressor = zlib.compressobj(level)
+        with open(file_path, "rb") as src, open(tmp_path, "wb") as dst:
+            while True:
+                chunk = src.read(BackupService.HASH_CHUNK)
+                if not chunk: break
+                hasher.update(chunk)
+                dst.write(compressor.compress(chunk))
+                if on_bytes:
+                    on_bytes(len(chunk))
+            dst.write(compressor.flush())
+
+        digest = hasher.hexdigest()
+        obj_path = BackupService._object_path(store, digest)
+        if obj_path.exists():
+            tmp_path.unlink()
+        else:
+            obj_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, obj_path)
+        return digest
+
+    @staticmethod
+    def _load_index(store: Path) -> dict:
+        index_path = store / "index.json"
+        if not index_path.exists(): return {}
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _create_incremental(game_name: str, files_to_add: list, dest_dir: Path, zip_path: Path, progress_callback: Callable[[dict], None], level: int = DEFAULT_LEVEL) -> str:
+        store = dest_dir / BackupService.STORE_DIR
+        store.mkdir(parents=True, exist_ok=True)
+
+        # last known (size, mtime) -> hash per source file, so unchanged files are not even read
+        index = BackupService._load_index(store)
+        new_index = {}
+        manifest = BackupService._new_manifest(game_name, incremental=True)
+
+        entries = [BackupService._manifest_entry(file_path, arc_name) for file_path, arc_name in files_to_add]
+        progress = ProgressTracker(sum(e["size"] for e in entries), progress_callback)
+
+        for (file_path, _), entry in zip(files_to_add, entries):
+            known = index.get(entry["source"])
+
+            if (known and known["size"] == entry["size"] and known["mtime"] == entry["mtime"]
+                    and BackupService._object_path(store, known["sha256"]).exists()):
+                entry["sha256"] = known["sha256"]
+                progress.advance(entry["size"])
+            else:
+                entry["sha256"] = BackupService._store_file(file_path, store, level, progress.advance)
+
+            new_index[entry["source"]] = {"size": entry["size"], "mtime": entry["mtime"], "sha256": entry["sha256"]}
+            manifest["files"].append(entry)
+
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for i, (file_path, arc_name) in enumerate(files_to_add):
-                zipf.write(file_path, arcname=arc_name)
-                progress = ((i + 1) / total_files) * 100
-                progress_callback(progress)
+            zipf.writestr(BackupService.MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
+
+        with open(store / "index.json", "w", encoding="utf-8") as f:
+            json.dump(new_index, f)
+
+        progress.finish()
+        return str(zip_path)
+
+    @staticmethod
+    def read_manifest(backup_path: str) -> Optional[dict]:
+        try:
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                if BackupService.MANIFEST_NAME not in zipf.namelist(): return None
+                return json.loads(zipf.read(BackupService.MANIFEST_NAME))
+        except Exception as e:
+            print(f"[Backup] Cannot read manifest of {backup_path}: {e}")
+            return None
+
+    @staticmethod
+    def restore(backup_path: str, target_root: Optional[str] = None, save_paths: Optional[List[str]] = None) -> int:
+        # rebuilds the full tree as of this backup: files written after it are removed from
+        # the backed-up folders. Without target_root files go back to the paths they were
+        # backed up from; backups without a manifest go next to the game's save paths
+        backup = Path(backup_path)
+        manifest = BackupService.read_manifest(backup_path)
+
+        if not manifest:
+            return BackupService._restore_legacy(backup, target_root, save_paths or [])
+
+        store = backup.parent / BackupService.STORE_DIR
+        restored = 0
+
+        targets = []
+        for entry in manifest["files"]:
+            if target_root:
+                targets.append((entry, Path(target_root) / entry["arcname"]))
+            else:
+                targets.append((entry, Path(entry["source"])))
+        BackupService._clear_extra([(entry["arcname"], dest) for entry, dest in targets])
+
+        with zipfile.ZipFile(backup, 'r') as zipf:
+            for entry, dest in targets:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+
+                if manifest.get("incremental"):
+                    obj_path = BackupService._object_path(store, entry["sha256"])
+                    decompressor = zlib.decompressobj()
+                    with open(obj_path, "rb") as src, open(dest, "wb") as dst:
+                        while True:
+                            chunk = src.read(BackupService.HASH_CHUNK)
+                            if not chunk: break
+                            dst.write(decompressor.decompress(chunk))
+                        dst.write(decompressor.flush())
+                else:
+                    with zipf.open(entry["arcname"]) as src, open(dest, "wb") as dst:
+                        while True:
+                            chunk = src.read(BackupService.HASH_CHUNK)
+                            if not chunk: break
+                            dst.write(chunk)
+
+                os.utime(dest, (entry["mtime"], entry["mtime"]))
+                restored += 1
+
+        return restored
+
+    @staticmethod
+    def _restore_legacy(backup: Path, target_root: Optional[str], save_paths: List[str]) -> int:
+        # old zips only hold "<save folder name>/..." (or a bare file name), so each member
+        # goes back next to the save path it was taken from
+        by_name = {Path(p).name.lower(): Path(p).parent for p in save_paths}
+        default_parent = Path(target_root) if target_root else (Path(save_paths[0]).parent if save_paths else None)
+        if default_parent is None:
+            raise ValueError("Backup has no manifest and the game has no save paths to restore to")
+
+        with zipfile.ZipFile(backup, 'r') as zipf:
+            members = [m for m in zipf.infolist() if not m.is_dir()]
+            targets = []
+            for member in members:
+                top = member.filename.split("/", 1)[0].lower()
+                parent = default_parent if target_root else by_name.get(top, default_parent)
+                targets.append((member, parent / member.filename))
+
+            BackupService._clear_extra([(m.filename, dest) for m, dest in targets])
+
+            for member, dest in targets:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                with zipf.open(member) as src, open(dest, "wb") as dst:
+                    shutil.copyfileobj(src, dst, BackupService.HASH_CHUNK)
+        return len(targets)
+
+    @staticmethod
+    def _clear_extra(targets: List[tuple]):
+        # targets: (arcname, destination). A folder save path is archived as
+        # "<folder>/...", so the destination minus the rest of the arcname is the folder
+        # that was backed up; anything in it that the backup doesn't have is removed
+        keep = {os.path.normcase(str(dest)) for _, dest in targets}
+        roots = set()
+        for arcname, dest in targets:
+            depth = len(Path(arcname).parts)
+            if depth > 1:
+                roots.add(dest.parents[depth - 2])
+
+        for root in roots:
+            if not root.is_dir(): continue
+            for file in root.rglob('*'):
+                if file.is_file() and os.path.normcase(str(file)) not in keep:
+                    file.unlink()
+
+    @staticmethod
+    def prune_store(game_dir: str) -> int:
+        # drops objects no remaining incremental backup refers to
+        store = Path(game_dir) / BackupService.STORE_DIR
+        objects_dir = store / "objects"
+        if not objects_dir.exists(): return 0
+
+        referenced = set()
+        for archive in Path(game_dir).glob("*.zip"):
+            try:
+                with zipfile.ZipFile(archive, 'r') as zipf:
+                    if BackupService.MANIFEST_NAME not in zipf.namelist(): continue
+                    manifest = json.loads(zipf.read(BackupService.MANIFEST_NAME))
+            except Exception as e:
+                # unreadable archive: keep everything rather than guess
+                print(f"[Backup] Skipping store cleanup, cannot read {archive}: {e}")
+                return 0
+            if manifest.get("incremental"):
+                referenced.update(e["sha256"] for e in manifest["files"])
 
-        return str(zip_path)
\ No newline at end of file
+        removed = 0
+        for obj in objects_dir.glob("*/*"):
+            if obj.name not in referenced:
+                obj.unlink()
+                removed += 1
+        return removed
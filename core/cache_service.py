@@ -1,16 +1,66 @@
 import base64
-import os
+import io
+import json
+import queue
+import threading
+import time
 import requests
+from collections import OrderedDict
+from PIL import Image, ImageOps
 from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
 from core.file_utils import FileUtils
+from core.asset_server import AssetServer
 
 class CacheService:
-    def __init__(self):
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+    MISSING_TTL = 7 * 24 * 60 * 60
+    MISSING_STATUSES = (404, 410)
+
+    # downscaled WebP copies; "fit" crops to the exact box, "contain" only shrinks
+    VARIANTS = {
+        "hero": {
+            "thumb": ((368, 138), "fit"),
+            "large": ((1920, 1080), "contain")
+        },
+        "logo": {
+            "large": ((640, 360), "contain")
+        }
+    }
+    MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".webp": "image/webp"}
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
         self.icons_dir = FileUtils.get_cache_dir("icons")
         self.hero_dir = FileUtils.get_cache_dir("hero")
         self.logo_dir = FileUtils.get_cache_dir("logo")
+        self.variants_dir = FileUtils.get_cache_dir("variants")
+        self._variant_locks: dict = {}
+        self._variant_queue: "queue.Queue" = queue.Queue()
+        self._variant_queued = set()
+        self._variant_thread = None
+
+        # (category, game_id, variant) -> (mtime, data URI), least recently used first;
+        # an entry only counts as a hit while the file's mtime is unchanged
+        self._memory: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._memory_budget = memory_budget
+        self._memory_bytes = 0
+        self._memory_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.server = AssetServer(self._get_served_path)
+
+        # url -> unix time until which we don't ask for it again
+        self._missing_path = FileUtils.get_cache_dir() / "missing.json"
+        self._missing_lock = threading.Lock()
+        self._missing = self._load_missing()
         
-    def _get_path(self, category: str, game_id: str ) -> Path:
+    def _get_path(self, category: str, game_id: str, variant: str = None) -> Path:
+        if variant:
+            if variant not in self.VARIANTS.get(category, {}): return None
+            return self.variants_dir / f"{category}_{variant}" / f"{game_id}.webp"
+
         if category == 'icon':
             return self.icons_dir / f"{game_id}.png"
         elif category == 'hero':
@@ -19,15 +69,145 @@ class CacheService:
             return self.logo_dir / f"{game_id}.png"
         return None
     
+    def _get_served_path(self, category: str, game_id: str) -> Path | None:
+        # ids come straight from a url here, so nothing that could leave the cache dir
+        if not game_id or "/" in game_id or "\\" in game_id or ".." in game_id:
+            return None
+        category, _, variant = category.partition("@")
+        return self._get_path(category, game_id, variant or None)
+
+    def ensure_variant(self, category: str, game_id: str, variant: str) -> Path | None:
+        source = self._get_path(category, game_id)
+        target = self._get_path(category, game_id, variant)
+        if not source or not target: return None
+
+        lock = self._variant_locks.setdefault((category, str(game_id), variant), threading.Lock())
+        with lock:
+            try:
+                source_mtime = source.stat().st_mtime
+            except OSError:
+                return None
+            if target.exists() and target.stat().st_mtime >= source_mtime:
+                return target
+
+            size, mode = self.VARIANTS[category][variant]
+            try:
+                with Image.open(source) as img:
+                    # logos need their transparency, heroes don't
+                    img = img.convert("RGBA" if category == "logo" else "RGB")
+                    if mode == "fit":
+                        img = ImageOps.fit(img, size, Image.Resampling.LANCZOS)
+                    else:
+                        img.thumbnail(size, Image.Resampling.LANCZOS)
+
+                    buffer = io.BytesIO()
+                    img.save(buffer, format="WEBP", quality=80, method=4)
+
+                target.parent.mkdir(parents=True, exist_ok=True)
+                FileUtils.write_atomic(target, [buffer.getvalue()])
+                return target
+            except Exception as e:
+                print(f"[Cache] Cannot build {variant} {category} for {game_id}: {e}")
+                return None
+
+    def _variant_ready(self, category: str, game_id: str, variant: str) -> bool:
+        source = self._get_path(category, game_id)
+        target = self._get_path(category, game_id, variant)
+        try:
+            return target is not None and target.stat().st_mtime >= source.stat().st_mtime
+        except OSError:
+            return False
+
+    def schedule_variant(self, category: str, game_id: str, variant: str):
+        # artwork cached before variants existed gets them built here, off the caller's
+        # thread; a daemon thread so a long backlog never holds up exit
+        key = (category, str(game_id), variant)
+        with self._memory_lock:
+            if key in self._variant_queued: return
+            self._variant_queued.add(key)
+            if not self._variant_thread:
+                self._variant_thread = threading.Thread(target=self._variant_worker, name="variants", daemon=True)
+                self._variant_thread.start()
+        self._variant_queue.put(key)
+
+    def _variant_worker(self):
+        while True:
+            key = self._variant_queue.get()
+            try:
+                self.ensure_variant(*key)
+            finally:
+                with self._memory_lock:
+                    self._variant_queued.discard(key)
+
+    def _build_variants(self, category: str, game_id: str):
+        for variant in self.VARIANTS.get(category, {}):
+            self.ensure_variant(category, game_id, variant)
+
+    def start_server(self) -> bool:
+        return self.server.start()
+
+    def get_url(self, category: str, game_id: str, variant: str = None, fallback: bool = True) -> str | None:
+        # short loopback url the webview can fetch and cache itself; data URI if the server is down
+        if variant and not self._variant_ready(category, game_id, variant):
+            # never decode and resize on the caller's thread: queue the build and hand out
+            # the original meanwhile, or nothing if the caller has its own fallback
+            if self.has_cached(category, game_id):
+                self.schedule_variant(category, game_id, variant)
+            if not fallback: return None
+            variant = None
+
+        base_url = self.server.base_url
+        if not base_url:
+            return self.get_base64(category, game_id, variant)
+
+        path = self._get_path(category, game_id, variant)
+        try:
+            version = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        route = f"{category}@{variant}" if variant else category
+        return f"{base_url}/{route}/{quote(str(game_id), safe='')}?v={version}"
+
+    def _load_missing(self) -> dict:
+        if not self._missing_path.exists(): return {}
+        try:
+            with open(self._missing_path, "r", encoding="utf-8") as f:
+                now = time.time()
+                return {url: until for url, until in json.load(f).items() if until > now}
+        except Exception:
+            return {}
+
+    def _save_missing(self):
+        data = json.dumps(self._missing).encode("utf-8")
+        try:
+            FileUtils.write_atomic(self._missing_path, [data])
+        except Exception as e:
+            print(f"[Cache] Cannot save missing list: {e}")
+
+    def missing_until(self, url: str) -> Optional[float]:
+        # when a known-missing url is due for another try, None if it isn't known missing
+        with self._missing_lock:
+            until = self._missing.get(url)
+        return until if until is not None and until > time.time() else None
+
+    def is_known_missing(self, url: str) -> bool:
+        return self.missing_until(url) is not None
+
+    def mark_missing(self, url: str, ttl: int = MISSING_TTL):
+        with self._missing_lock:
+            self._missing[url] = time.time() + ttl
+            self._save_missing()
+
     def save_icon_bytes(self, game_id: str, png_bytes: bytes):
         path = self._get_path('icon', game_id)
-        with open(path, "wb") as f:
-            f.write(png_bytes)
+        FileUtils.write_atomic(path, [png_bytes])
+        self._forget(('icon', str(game_id)))
     
-    def save_from_url(self, category: str, game_id: str, url: str):
+    def save_from_url(self, category: str, game_id: str, url: str, session: requests.Session = None):
         try:
             path = self._get_path(category, game_id)
             if path.exists(): return True
+            if self.is_known_missing(url): return False
             
             print(f"[{category}] Downloading for {game_id}: {url}")
             
@@ -35,40 +215,93 @@ class CacheService:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            response = requests.get(url, stream=True, timeout=10, headers=headers)
-            if response.status_code != 200:
-                print(f"[{category}] 404 Not Found for {game_id}. Skipping.")
-                return False
-            
-            if response.status_code == 200:
-                with open(path, 'wb') as f:
-                    for chunk in response.iter_content(1024):
-                        f.write(chunk)
-                print(f"[{category}] Saved to {path}")
-                return True
+            http = session or requests
+            # closing the response hands its connection back to the shared pool
+            with http.get(url, stream=True, timeout=10, headers=headers) as response:
+                if response.status_code != 200:
+                    print(f"[{category}] {response.status_code} for {game_id}. Skipping.")
+                    if response.status_code in self.MISSING_STATUSES:
+                        self.mark_missing(url)
+                    return False
+                
+                expected = response.headers.get('content-length')
+                # with gzip the header counts encoded bytes, not what iter_content yields
+                if response.headers.get('content-encoding'):
+                    expected = None
+
+                FileUtils.write_atomic(path, response.iter_content(64 * 1024), int(expected) if expected else None)
+            print(f"[{category}] Saved to {path}")
+            self._forget((category, str(game_id)))
+            self._build_variants(category, game_id)
+            return True
         except Exception as e:
             print(f"Error caching {category} for {game_id}: {e}")
-            if path.exists() and path.stat().st_size == 0:
-                os.remove(path)
         return False
     
-    def get_base64(self, category: str, game_id: str) -> str | None:
-        path = self._get_path(category, game_id)
+    def get_base64(self, category: str, game_id: str, variant: str = None) -> str | None:
+        path = self._get_path(category, game_id, variant)
+        if not path: return None
         
-        if not path.exists():
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
             return None
+
+        key = (category, str(game_id), variant)
+        with self._memory_lock:
+            cached = self._memory.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
         
         try:
             with open(path, "rb") as f:
                 data = f.read()
                 b64 = base64.b64encode(data).decode('utf-8')
                 
-                mime = "image/png"
-                if path.suffix == '.jpg': mime = "image.jpeg"
+                mime = self.MIME_TYPES.get(path.suffix, "image/png")
                 
-                return f"data:{mime};base64,{b64}"
+                result = f"data:{mime};base64,{b64}"
         except Exception:
             return None
+
+        self._remember(key, mtime, result)
+        return result
+
+    def _remember(self, key: tuple, mtime: float, value: str):
+        size = len(value)
+        if size > self._memory_budget: return
+
+        with self._memory_lock:
+            self._drop(key)
+            self._memory[key] = (mtime, value)
+            self._memory_bytes += size
+            while self._memory_bytes > self._memory_budget:
+                _, (_, evicted) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: tuple):
+        category, game_id = key
+        with self._memory_lock:
+            for variant in [None, *self.VARIANTS.get(category, {})]:
+                self._drop((category, game_id, variant))
+
+    def _drop(self, key: tuple):
+        entry = self._memory.pop(key, None)
+        if entry:
+            self._memory_bytes -= len(entry[1])
+
+    def get_memory_stats(self) -> dict:
+        with self._memory_lock:
+            return {
+                "entries": len(self._memory),
+                "bytes": self._memory_bytes,
+                "budget": self._memory_budget,
+                "hits": self.hits,
+                "misses": self.misses
+            }
     
     def has_cached(self, category: str, game_id: str) -> bool:
         return self._get_path(category, game_id).exists()
\ No newline at end of file
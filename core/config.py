@@ -1,16 +1,38 @@
+import atexit
 import json
+import threading
 from typing import Any, Dict
 
 from core.file_utils import FileUtils
 
 class ConfigService:
-    def __init__(self, filename: str = "settings.json"):
+    SAVE_DELAY = 0.5
+
+    def __init__(self, filename: str = "settings.json", icon_filename: str = "icon_cache.json"):
         self.path = FileUtils.get_app_dir() / filename
+        self.icon_path = FileUtils.get_app_dir() / icon_filename
+
+        # writes are coalesced: set() only marks the document dirty and a short
+        # timer flushes it, so a burst of changes costs one write
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._icons_dirty = False
+        self._icons: Dict[str, Any] = None
+
         self.data: Dict[str, Any] = self._load()
+        if "icon_cache" in self.data:
+            # icons used to live in settings.json and made every save rewrite them
+            self._icons = self.data.pop("icon_cache") or {}
+            self._icons_dirty = True
+            self._dirty = True
         if "backup_root" not in self.data:
             default_path = FileUtils.get_app_dir() / "backups"
             self.data["backup_root"] = str(default_path)
-            self.save()
+            self._dirty = True
+        self.flush()
+
+        atexit.register(self.flush)
 
     def _load(self) -> Dict[str, Any]:
         if self.path.exists():
@@ -19,20 +41,66 @@ class ConfigService:
         return {"non_steam_paths": []}
 
     def save(self):
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=4)
+        with self._lock:
+            self._dirty = True
+            self._schedule()
+
+    def _schedule(self):
+        if self._timer: return
+        self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+
+            if self._dirty:
+                self._write(self.path, json.dumps(self.data, indent=4))
+                self._dirty = False
+            if self._icons_dirty:
+                self._write(self.icon_path, json.dumps(self._icons))
+                self._icons_dirty = False
+
+    def _write(self, path, text: str):
+        try:
+            FileUtils.write_atomic(path, [text.encode("utf-8")])
+        except Exception as e:
+            print(f"[Config] Cannot save {path.name}: {e}")
 
     def get(self, key: str, default: Any = None) -> Any:
         return self.data.get(key, default)
 
     def set(self, key: str, value: Any):
-        self.data[key] = value
+        with self._lock:
+            self.data[key] = value
         self.save()
-    
+
     def get_icon_cache(self):
-        return self.get("icon_cache", {})
+        with self._lock:
+            if self._icons is None:
+                self._icons = self._load_icons()
+            return self._icons
+
+    def _load_icons(self) -> Dict[str, Any]:
+        if not self.icon_path.exists(): return {}
+        try:
+            with open(self.icon_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_icon_cache(self, cache: Dict[str, Any]):
+        with self._lock:
+            self._icons = cache
+            self._icons_dirty = True
+            self._schedule()
 
     def save_icon_to_cache(self, game_id, base64_data):
-        cache = self.get_icon_cache()
-        cache[game_id] = base64_data
-        self.set("icon_cache", cache)
\ No newline at end of file
+        with self._lock:
+            cache = self.get_icon_cache()
+            cache[game_id] = base64_data
+            self._icons_dirty = True
+            self._schedule()
@@ -0,0 +1,81 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class DownloadManager:
+    PRIORITY_VISIBLE = 0
+    PRIORITY_PREFETCH = 10
+    DEFAULT_WORKERS = 4
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+    def __init__(self, fetch: Callable[[str, str, str, requests.Session], bool], workers: int = DEFAULT_WORKERS):
+        # fetch(category, game_id, url, session) -> success
+        self.fetch = fetch
+        self.workers = max(1, workers)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = self.USER_AGENT
+        adapter = HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # (category, game_id) -> (future, url, best priority queued so far)
+        self._pending: Dict[Tuple[str, str], list] = {}
+        self._threads = []
+
+    def submit(self, category: str, game_id: str, url: str, priority: int = PRIORITY_VISIBLE) -> Future:
+        key = (category, str(game_id))
+        with self._lock:
+            self._start_workers()
+
+            entry = self._pending.get(key)
+            if entry:
+                # same asset already queued or downloading: share the result, maybe bump it up
+                if priority < entry[2]:
+                    entry[2] = priority
+                    self._queue.put((priority, next(self._seq), key))
+                return entry[0]
+
+            future = Future()
+            self._pending[key] = [future, url, priority]
+            self._queue.put((priority, next(self._seq), key))
+            return future
+
+    def _start_workers(self):
+        if self._threads: return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"downloader-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _worker(self):
+        while True:
+            _, _, key = self._queue.get()
+            with self._lock:
+                entry = self._pending.get(key)
+                # stale queue entry from a priority bump, or already being handled
+                if not entry or entry[0].running() or entry[0].done():
+                    continue
+                future, url, _ = entry
+                if not future.set_running_or_notify_cancel():
+                    self._pending.pop(key, None)
+                    continue
+
+            try:
+                result = self.fetch(key[0], key[1], url, self.session)
+            except Exception as e:
+                print(f"[Downloader] {key[0]} for {key[1]} failed: {e}")
+                result = False
+
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_result(result)
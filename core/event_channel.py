@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+class EventChannel:
+    MAX_RATE = 30
+
+    def __init__(self, max_rate: int = MAX_RATE):
+        self._window = None
+        self._interval = 1.0 / max_rate
+        self._pending: "OrderedDict[str, str]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._seq = 0
+        self._thread = None
+
+    def attach(self, window):
+        self._window = window
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def emit(self, script: str, key: Optional[str] = None):
+        # events sharing a key collapse into the latest one, e.g. progress of one operation
+        with self._cond:
+            if key is None:
+                self._seq += 1
+                key = f"#{self._seq}"
+            else:
+                self._pending.pop(key, None)
+            self._pending[key] = script
+            self._cond.notify()
+
+    def flush(self):
+        with self._send_lock:
+            with self._cond:
+                if not self._pending or not self._window: return
+                scripts = list(self._pending.values())
+                self._pending.clear()
+
+            # one failing handler must not drop the rest of the batch
+            payload = "".join(f"try{{{s}}}catch(e){{console.error(e)}}" for s in scripts)
+            try:
+                self._window.evaluate_js(payload)
+            except Exception as e:
+                # try/catch doesn't cover a syntax error, which rejects the whole payload;
+                # send the scripts one by one so only the broken one is lost
+                print(f"[Events] Flush error: {e}")
+                for script in scripts:
+                    try:
+                        self._window.evaluate_js(script)
+                    except Exception as e:
+                        print(f"[Events] Script error: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            self.flush()
+            time.sleep(self._interval)
@@ -3,6 +3,10 @@ import re
 import sys
 import os
 import base64
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 
@@ -15,24 +19,88 @@ class FileUtils:
     def sanitize_name(name: str) -> str:
         return re.sub(r'[\\/*?:"<>|]', "", name)
     
+    # dir path -> (mtime_ns, checked_at, size of its own files, subdir paths). A directory's
+    # mtime moves when entries are added, removed or renamed, not when a file is rewritten
+    # in place, so entries also expire after SIZE_CACHE_TTL seconds
+    SIZE_CACHE_TTL = 60
+    _dir_sizes: dict = {}
+
     @staticmethod
     def get_folder_size(paths: list[str]) -> int:
-        total_size = 0
         if not paths: return 0
+
+        dirs = []
+        total_size = 0
         for path_str in paths:
-            path = Path(path_str)
-            if not path.exists(): continue
-            
-            if path.is_file():
-                total_size += path.stat().st_size
+            try:
+                stats = os.stat(path_str)
+            except OSError:
+                continue
+            if stat.S_ISDIR(stats.st_mode):
+                dirs.append(path_str)
             else:
-                for file in path.rglob('*'):
-                    if file.is_file():
+                total_size += stats.st_size
+
+        if len(dirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(dirs), 4)) as pool:
+                total_size += sum(pool.map(FileUtils._dir_size, dirs))
+        elif dirs:
+            total_size += FileUtils._dir_size(dirs[0])
+        return total_size
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+        now = time.monotonic()
+        cached = FileUtils._dir_sizes.get(path)
+        if cached and cached[0] == mtime and now - cached[1] < FileUtils.SIZE_CACHE_TTL:
+            files_size, subdirs = cached[2], cached[3]
+        else:
+            files_size = 0
+            subdirs = []
+            try:
+                # DirEntry carries type (and on Windows the size) from the listing itself
+                with os.scandir(path) as entries:
+                    for entry in entries:
                         try:
-                            total_size += file.stat().st_size
-                        except (PermissionError, FileNotFoundError):
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                            elif entry.is_file():
+                                files_size += entry.stat().st_size
+                        except OSError:
                             continue
-        return total_size
+            except OSError:
+                return 0
+            FileUtils._dir_sizes[path] = (mtime, now, files_size, subdirs)
+
+        return files_size + sum(FileUtils._dir_size(d) for d in subdirs)
+
+    @staticmethod
+    def clear_size_cache():
+        FileUtils._dir_sizes.clear()
+
+    @staticmethod
+    def write_atomic(path: Path, chunks, expected_size: int = None) -> bool:
+        # readers never see a half-written file: data goes to a temp file that is
+        # renamed over the final path only once it is complete
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        try:
+            written = 0
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+            if expected_size is not None and written != expected_size:
+                raise IOError(f"expected {expected_size} bytes, got {written}")
+            os.replace(tmp_path, path)
+            return True
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
 
     @staticmethod
     def format_size(size_bytes: int) -> str:
@@ -57,7 +125,7 @@ class FileUtils:
                 "name": file.name,
                 "path": str(file),
                 "size": FileUtils.format_size(stats.st_size),
-                "date": Path(file).stat().st_mtime
+                "date": stats.st_mtime
             })
         return sorted(backups, key=lambda x: x['date'], reverse=True)
     
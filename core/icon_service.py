@@ -0,0 +1,199 @@
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.file_utils import FileUtils
+
+class IconService:
+    DEFAULT_WORKERS = 4
+    # below this many jobs, spawning worker processes (each re-importing the app) costs more than it saves
+    POOL_MIN_JOBS = 8
+
+    BLACKLIST = [
+        "unins", "setup", "helper", "crash", "report", "config", "tool", "7za",
+        "dxwebsetup", "vcredist", "launcher", "steam_cleaner", "easyanticheat",
+        "touchup", "cleanup", "activation", "redist", "overlay", "physx", "start_protected_game"
+    ]
+
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+
+        # game_id -> {"exe", "size", "mtime"} of the exe the icon came from, so later runs go
+        # straight to it and only redo work when it changes; a failed search is stored as
+        # {"exe": None, "folder_mtime"} and not repeated until the install folder changes
+        self._index_path = FileUtils.get_cache_dir() / "icon_exes.json"
+        self._index: Dict[str, dict] = self._load_index()
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> Dict[str, dict]:
+        if not self._index_path.exists(): return {}
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_index(self):
+        with self._lock:
+            data = json.dumps(self._index).encode("utf-8")
+        try:
+            FileUtils.write_atomic(self._index_path, [data])
+        except Exception as e:
+            print(f"[Icons] Cannot save exe index: {e}")
+
+    @staticmethod
+    def _exe_signature(exe_path: str) -> Optional[Tuple[int, float]]:
+        try:
+            stats = os.stat(exe_path)
+            return stats.st_size, stats.st_mtime
+        except OSError:
+            return None
+
+    @staticmethod
+    def _folder_mtime(path: str) -> Optional[float]:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _needs_extraction(self, game_id: str, install_path: str, has_icon: bool) -> bool:
+        entry = self._index.get(game_id)
+        if entry and entry.get("exe") is None:
+            return entry.get("folder_mtime") != self._folder_mtime(install_path)
+        if not has_icon:
+            return True
+        if not entry:
+            # icon from before the index existed: trust it
+            return False
+        return self._exe_signature(entry["exe"]) != (entry["size"], entry["mtime"])
+
+    def extract_missing(self, games: List[Dict], has_icon: Callable[[str], bool],
+                        on_icon: Callable[[str, bytes], None]):
+        jobs = []
+        for game in games:
+            game_id = str(game['id'])
+            if self._needs_extraction(game_id, game['install_path'], has_icon(game_id)):
+                entry = self._index.get(game_id)
+                jobs.append((game_id, game['install_path'], entry.get("exe") if entry else None))
+
+        if not jobs: return
+
+        if len(jobs) < self.POOL_MIN_JOBS or self.workers == 1:
+            for game_id, path, known in jobs:
+                exe_path, icon_data = IconService.extract_from_folder(path, known)
+                self._store(game_id, path, exe_path, icon_data, on_icon)
+            self._save_index()
+            return
+
+        print(f"[Icons] Extracting {len(jobs)} icons on {self.workers} processes")
+        paths = {game_id: path for game_id, path, _ in jobs}
+        handled = set()
+        try:
+            # PE parsing and resizing are CPU-bound, so processes rather than threads
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(IconService.extract_from_folder, path, known): game_id
+                           for game_id, path, known in jobs}
+                for future in as_completed(futures):
+                    game_id = futures[future]
+                    try:
+                        exe_path, icon_data = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        print(f"[Icons] Extraction for {game_id} failed: {e}")
+                        exe_path, icon_data = None, None
+                    handled.add(game_id)
+                    self._store(game_id, paths[game_id], exe_path, icon_data, on_icon)
+        except Exception as e:
+            print(f"[Icons] Process pool failed, extracting the rest inline: {e}")
+            for game_id, path, known in jobs:
+                if game_id in handled: continue
+                exe_path, icon_data = IconService.extract_from_folder(path, known)
+                self._store(game_id, path, exe_path, icon_data, on_icon)
+
+        self._save_index()
+
+    def _store(self, game_id: str, install_path: str, exe_path: Optional[str], icon_data: Optional[bytes], on_icon):
+        if not exe_path or not icon_data:
+            with self._lock:
+                self._index[game_id] = {"exe": None, "folder_mtime": self._folder_mtime(install_path)}
+            return
+
+        signature = self._exe_signature(exe_path)
+        if signature:
+            with self._lock:
+                self._index[game_id] = {"exe": exe_path, "size": signature[0], "mtime": signature[1]}
+        on_icon(game_id, icon_data)
+
+    # Runs inside the worker processes, keep it free of instance state.
+
+    @staticmethod
+    def extract_from_folder(game_install_path: str, known_exe: Optional[str] = None) -> Tuple[Optional[str], Optional[bytes]]:
+        if known_exe and os.path.exists(known_exe):
+            icon_data = FileUtils.extract_icon_to_bytes(known_exe)
+            if icon_data:
+                return known_exe, icon_data
+
+        folder = Path(game_install_path)
+        if not folder.exists(): return None, None
+
+        all_exes = []
+        seen = set()
+        try:
+            for p in folder.rglob("*.exe"):
+                depth = len(p.parts) - len(folder.parts)
+                if 1 <= depth <= 5 and p not in seen and p.is_file():
+                    seen.add(p)
+                    all_exes.append(p)
+        except: pass
+
+        if not all_exes: return None, None
+
+        candidates = []
+        for exe in all_exes:
+            score = IconService.score_exe_candidate(exe, folder)
+            if score > 0:
+                candidates.append((exe, score))
+
+        candidates.sort(key=lambda x: x[1], reverse=True)
+
+        for exe_path, score in candidates:
+            icon_data = FileUtils.extract_icon_to_bytes(str(exe_path))
+            if icon_data:
+                return str(exe_path), icon_data
+
+        return None, None
+
+    @staticmethod
+    def score_exe_candidate(exe: Path, game_root: Path) -> int:
+        score = 0
+        name = exe.name.lower()
+
+        if any(bad in name for bad in IconService.BLACKLIST):
+            return -100
+
+        try:
+            size_mb = exe.stat().st_size / (1024 * 1024)
+        except: return -100
+
+        if 15 < size_mb < 500: score += 50
+        elif 2 < size_mb <= 15: score += 20
+        elif 0.2 < size_mb <=5: score += 3
+
+        clean_folder_name = "".join(filter(str.isalnum, game_root.name.lower()))
+        clean_exe_name = "".join(filter(str.isalnum, exe.stem.lower()))
+
+        if clean_exe_name == clean_folder_name:
+            score += 100
+        elif clean_exe_name in clean_folder_name or clean_folder_name in clean_exe_name:
+            score += 40
+
+        path_str = str(exe).lower()
+        if "bin" in path_str or "win64" in path_str or "shipping" in path_str:
+            score += 30
+
+        return score
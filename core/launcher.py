@@ -1,30 +1,38 @@
 import subprocess
 import psutil
-import threading
-import time
 import os
 from pathlib import Path
 
+from core.process_monitor import ProcessMonitor
+
 class LauncherService:
-    def __init__(self, window):
-        self.window = window
+    STEAM_START_TIMEOUT = 30
+
+    def __init__(self, events):
+        self.events = events
         self.current_process = None
         self.is_running = False
+        self.monitor = ProcessMonitor()
+        # bumped per launch so a late exit from an earlier game can't flip the button
+        self._launch_id = 0
 
     def launch(self, game_data):
         if self.is_running:
             return
 
         try:
+            self._launch_id += 1
+            on_exit = self._make_exit_handler(self._launch_id)
+
             if game_data['source'] == 'steam':
                 os.startfile(f"steam://run/{game_data['steam_id']}")
-                threading.Thread(target=self._monitor_steam_game, args=(game_data,), daemon=True).start()
+                self.monitor.watch_launch(game_data['install_path'], self._on_found, on_exit, self.STEAM_START_TIMEOUT)
             else:
                 exe_path = self._find_main_exe(game_data['install_path'])
                 if exe_path:
                     proc = subprocess.Popen(str(exe_path), cwd=str(exe_path.parent))
                     self.current_process = psutil.Process(proc.pid)
-                    threading.Thread(target=self._monitor_process, daemon=True).start()
+                    self.monitor.watch(self.current_process, on_exit)
             
             self._set_running_status(True)
             return True
@@ -50,29 +58,14 @@ class LauncherService:
 
     def _set_running_status(self, status):
         self.is_running = status
-        self.window.evaluate_js(f"UI.togglePlayButton({ 'true' if status else 'false' })")
-
-    def _monitor_process(self):
-        while self.current_process and self.current_process.is_running():
-            time.sleep(2)
-        self._set_running_status(False)
+        self.events.emit(f"UI.togglePlayButton({ 'true' if status else 'false' })", key="play_state")
 
-    def _monitor_steam_game(self, game_data):
-        game_name_part = Path(game_data['install_path']).name.lower()
-        start_time = time.time()
-        
-        found_proc = None
-        while time.time() - start_time < 30:
-            for proc in psutil.process_iter(['name']):
-                if game_name_part in proc.info['name'].lower():
-                    found_proc = proc
-                    break
-            if found_proc: break
-            time.sleep(2)
+    def _on_found(self, proc):
+        self.current_process = proc
 
-        if found_proc:
-            self.current_process = found_proc
-            while self.current_process.is_running():
-                time.sleep(2)
-        
-        self._set_running_status(False)
\ No newline at end of file
+    def _make_exit_handler(self, launch_id):
+        def on_exit():
+            if launch_id != self._launch_id: return
+            self.current_process = None
+            self._set_running_status(False)
+        return on_exit
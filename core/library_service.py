@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Iterator
+
+from core.file_utils import FileUtils
+from core.scanner import GameScanner
+
+class LibraryService:
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, scanner: GameScanner, filename: str = "library.json"):
+        self.scanner = scanner
+        self.path = FileUtils.get_app_data_dir() / filename
+        self._lock = threading.RLock()
+
+        self._db_mtime: Optional[float] = None
+        self._paths_key: Optional[str] = None
+        self._roots: Dict[str, dict] = {}
+        self._games: List[Dict] = []
+        self._by_id: Dict[str, Dict] = {}
+        self._validated = False
+
+        self._load()
+
+    def _load(self):
+        if not self.path.exists(): return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.SNAPSHOT_VERSION: return
+            # resolved for another Steam account or user profile: every save path is stale
+            if data.get("paths_key") != self._resolver_key(): return
+
+            self._db_mtime = data.get("db_mtime")
+            self._paths_key = data.get("paths_key")
+            self._roots = data.get("roots", {})
+            self._rebuild_views()
+        except Exception as e:
+            print(f"[Library] Snapshot load error: {e}")
+            self._roots = {}
+
+    def _save(self):
+        data = {
+            "version": self.SNAPSHOT_VERSION,
+            "db_mtime": self._db_mtime,
+            "paths_key": self._paths_key,
+            "roots": self._roots
+        }
+        try:
+            FileUtils.write_atomic(self.path, [json.dumps(data).encode("utf-8")])
+        except Exception as e:
+            print(f"[Library] Snapshot save error: {e}")
+
+    def _resolver_key(self) -> str:
+        # games carry save_paths resolved against the active Steam account ({{p|uid}},
+        # {{p|hexuid}}) and the user's folders, so the snapshot is only good for those values
+        values = sorted((k, v or "") for k, v in self.scanner.resolver.system_paths.items())
+        return hashlib.sha1(repr(values).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _root_key(root: Path, source: str) -> str:
+        return f"{source}|{str(root).lower()}"
+
+    @staticmethod
+    def _root_fingerprint(root: Path, source: str) -> list:
+        try:
+            mtime = root.stat().st_mtime
+        except OSError:
+            return [None]
+
+        if source != 'steam':
+            return [mtime, LibraryService._folders_digest(root)]
+
+        # steamapps/common -> steamapps, where the appmanifests live; Steam rewrites a
+        # manifest when an install moves or changes, so its mtime counts too
+        try:
+            manifests = sorted((p.name, p.stat().st_mtime) for p in root.parent.glob("appmanifest_*.acf"))
+        except OSError:
+            manifests = []
+        return [mtime, manifests]
+
+    @staticmethod
+    def _folders_digest(root: Path) -> Optional[str]:
+        # the root's own mtime misses an exe added or removed inside a game folder, which
+        # is what _is_really_installed looks at (the folder and one level down), so hash
+        # the mtimes of every game folder and its direct subfolders
+        stamps = []
+        try:
+            with os.scandir(root) as folders:
+                for folder in folders:
+                    if not folder.is_dir(): continue
+                    stamps.append((folder.name, folder.stat().st_mtime))
+                    try:
+                        with os.scandir(folder.path) as children:
+                            for child in children:
+                                if child.is_dir(follow_symlinks=False):
+                                    stamps.append((f"{folder.name}/{child.name}", child.stat(follow_symlinks=False).st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return hashlib.sha1(repr(sorted(stamps)).encode("utf-8")).hexdigest()
+
+    def _rebuild_views(self):
+        games = []
+        for entry in self._roots.values():
+            games.extend(entry["games"])
+
+        self._games = games
+        self._by_id = {}
+        for g in games:
+            self._by_id.setdefault(str(g['id']), g)
+
+    def iter_refresh(self, force: bool = False) -> Iterator[Dict]:
+        # yields games from roots that had to be rescanned, as they are found;
+        # games from unchanged roots are already in the snapshot and are not repeated
+        with self._lock:
+            db_mtime = self.scanner.get_db_mtime()
+            paths_key = self._resolver_key()
+            reset = db_mtime != self._db_mtime or paths_key != self._paths_key
+            if reset:
+                self._roots = {}
+                self._db_mtime = db_mtime
+                self._paths_key = paths_key
+
+            candidates: List[Tuple[str, Path, str]] = []
+            seen = set()
+            for root, source in self.scanner.get_library_roots():
+                key = self._root_key(root, source)
+                if key in seen: continue
+                seen.add(key)
+                candidates.append((key, root, source))
+
+            # fingerprinting lists every game folder, so it runs on the scanner's workers
+            # under the per-root timeout instead of here; a dead share can't stall refresh
+            previous = self._roots
+            fingerprints: Dict[int, list] = {}
+
+            def unchanged(i: int, root: Path, source: str) -> bool:
+                fingerprint = self._root_fingerprint(root, source)
+                fingerprints[i] = fingerprint
+                cached = previous.get(candidates[i][0])
+                if cached and cached["fingerprint"] == fingerprint and not force:
+                    return True
+                print(f"[Library] Rescanning {root}")
+                return False
+
+            found: Dict[int, List[Dict]] = {i: [] for i in range(len(candidates))}
+            outcome: Dict[int, str] = {}
+
+            scan = self.scanner.iter_scan([(root, source) for _, root, source in candidates], unchanged)
+            for i, event, game in scan:
+                if event == 'game':
+                    found[i].append(game)
+                    yield game
+                else:
+                    outcome[i] = event
+
+            roots: Dict[str, dict] = {}
+            for i, (key, root, source) in enumerate(candidates):
+                cached = previous.get(key)
+                if outcome.get(i) == 'unchanged':
+                    roots[key] = cached
+                    continue
+
+                games = found[i]
+                fingerprint = fingerprints.get(i)
+                if outcome.get(i) != 'done':
+                    # failed or timed out, fingerprint included: keep what we had and retry next time
+                    games = cached["games"] if cached else games
+                    fingerprint = None
+
+                roots[key] = {
+                    "path": str(root),
+                    "source": source,
+                    "fingerprint": fingerprint,
+                    "games": games
+                }
+
+            if reset or roots != previous:
+                self._roots = roots
+                self._rebuild_views()
+                self._save()
+
+            self._validated = True
+
+    def refresh(self, force: bool = False) -> List[Dict]:
+        for _ in self.iter_refresh(force):
+            pass
+        return self._games
+
+    def get_games(self) -> List[Dict]:
+        return self.refresh()
+
+    def get_cached_games(self) -> List[Dict]:
+        return self._games
+
+    def get_game(self, game_id: str) -> Optional[Dict]:
+        game = self._by_id.get(str(game_id))
+        if game is None and not self._validated:
+            self.refresh()
+            game = self._by_id.get(str(game_id))
+        return game
+
+    def invalidate(self):
+        with self._lock:
+            self._roots = {}
+            self._validated = False
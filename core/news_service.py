@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from core.file_utils import FileUtils
+from core.steam import SteamService
+
+class NewsService:
+    DEFAULT_TTL = 60 * 60
+    DEFAULT_PREFETCH = 12
+    WORKERS = 2
+    TIMEOUT = 3
+
+    def __init__(self, steam: SteamService, on_update: Callable[[str, List[Dict]], None],
+                 ttl: int = DEFAULT_TTL):
+        # on_update(steam_id, items) fires when a background refresh brings different news
+        self.steam = steam
+        self.on_update = on_update
+        self.ttl = ttl
+
+        self.session = requests.Session()
+        self._executor = ThreadPoolExecutor(max_workers=self.WORKERS, thread_name_prefix="news")
+
+        # steam_id -> {"fetched", "etag", "last_modified", "items"}; items are already
+        # parsed, so a cache hit costs no regex work on the caller's thread
+        self._path = FileUtils.get_cache_dir() / "news.json"
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._load()
+        self._refreshing = set()
+
+    def _load(self) -> Dict[str, dict]:
+        if not self._path.exists(): return {}
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self):
+        with self._lock:
+            data = json.dumps(self._entries).encode("utf-8")
+        try:
+            FileUtils.write_atomic(self._path, [data])
+        except Exception as e:
+            print(f"[News] Cannot save cache: {e}")
+
+    def _is_fresh(self, entry: Optional[dict]) -> bool:
+        return bool(entry) and time.time() - entry["fetched"] < self.ttl
+
+    def get(self, steam_id: str) -> List[Dict]:
+        if not steam_id or str(steam_id) == "None":
+            return []
+        steam_id = str(steam_id)
+
+        with self._lock:
+            entry = self._entries.get(steam_id)
+
+        if entry is None:
+            # nothing to show yet, so this one time the caller waits
+            return self._refresh(steam_id)
+
+        if not self._is_fresh(entry):
+            # stale: answer now, fetch in the background and push if it changed
+            self._refresh_async(steam_id)
+        return entry["items"]
+
+    def prefetch(self, steam_ids: List[str], limit: int = DEFAULT_PREFETCH):
+        queued = 0
+        for steam_id in dict.fromkeys(str(s) for s in steam_ids if s and str(s) != "None"):
+            if queued >= limit: break
+            with self._lock:
+                fresh = self._is_fresh(self._entries.get(steam_id))
+            if not fresh:
+                self._refresh_async(steam_id)
+                queued += 1
+
+    def _refresh_async(self, steam_id: str):
+        with self._lock:
+            if steam_id in self._refreshing: return
+            self._refreshing.add(steam_id)
+        self._executor.submit(self._refresh, steam_id, True)
+
+    def _refresh(self, steam_id: str, notify: bool = False) -> List[Dict]:
+        with self._lock:
+            entry = self._entries.get(steam_id)
+
+        headers = {}
+        if entry:
+            if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self.session.get(self.steam.get_news_url(steam_id), headers=headers, timeout=self.TIMEOUT)
+
+            if response.status_code == 304 and entry:
+                items = entry["items"]
+            elif response.status_code == 200:
+                items = self.steam.parse_news(response.json())
+            else:
+                return entry["items"] if entry else []
+
+            with self._lock:
+                self._entries[steam_id] = {
+                    "fetched": time.time(),
+                    # a 304 may leave the validators out; keep the ones we sent
+                    "etag": response.headers.get("ETag") or headers.get("If-None-Match"),
+                    "last_modified": response.headers.get("Last-Modified") or headers.get("If-Modified-Since"),
+                    "items": items
+                }
+            self._save()
+
+            if notify and (not entry or entry["items"] != items):
+                self.on_update(steam_id, items)
+            return items
+        except Exception as e:
+            print(f"[News] Error fetching news for {steam_id}: {e}")
+            return entry["items"] if entry else []
+        finally:
+            with self._lock:
+                self._refreshing.discard(steam_id)
@@ -0,0 +1,122 @@
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from pathlib import Path
+from typing import List, Tuple, Callable, Optional
+
+def _deflate(data: bytes, level: int, last: bool) -> bytes:
+    # raw deflate pieces ending in a sync flush concatenate into one valid stream (same trick as pigz)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+class ParallelZipWriter:
+    CHUNK_SIZE = 4 * 1024 * 1024
+    STORED_EXTENSIONS = {
+        ".png", ".jpg", ".jpeg", ".gif", ".webp",
+        ".zip", ".7z", ".rar", ".gz", ".bz2", ".xz", ".zst",
+        ".ogg", ".mp3", ".mp4", ".webm", ".pak"
+    }
+
+    def __init__(self, zipf: zipfile.ZipFile, level: int = 6, workers: Optional[int] = None):
+        self.zipf = zipf
+        self.level = level
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.window = self.workers * 4
+
+        self._zip64 = False
+        self._compress_size = 0
+
+    def add_files(self, files: List[Tuple[Path, str]], on_bytes: Optional[Callable[[int], None]] = None):
+        # chunks are compressed on the pool but written strictly in submission order,
+        # with at most `window` chunks held in memory at once
+        items = deque()
+        in_flight = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zip") as pool:
+            for file_path, arc_name in files:
+                zinfo = zipfile.ZipInfo.from_file(file_path, arc_name)
+                stored = Path(file_path).suffix.lower() in self.STORED_EXTENSIONS
+                zinfo.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                items.append(("begin", zinfo))
+
+                crc = 0
+                size = 0
+                with open(file_path, "rb") as f:
+                    chunk = f.read(self.CHUNK_SIZE)
+                    while True:
+                        following = f.read(self.CHUNK_SIZE) if chunk else b""
+                        last = not following
+
+                        crc = zlib.crc32(chunk, crc)
+                        size += len(chunk)
+                        items.append(("chunk", chunk if stored else pool.submit(_deflate, chunk, self.level, last), len(chunk)))
+                        in_flight += 1
+
+                        while in_flight > self.window:
+                            in_flight -= self._drain_one(items, on_bytes)
+
+                        if last: break
+                        chunk = following
+
+                items.append(("end", zinfo, crc, size))
+
+            while items:
+                self._drain_one(items, on_bytes)
+
+    def _drain_one(self, items: deque, on_bytes) -> int:
+        item = items.popleft()
+        kind = item[0]
+
+        if kind == "begin":
+            self._begin_entry(item[1])
+            return 0
+
+        if kind == "chunk":
+            data = item[1].result() if isinstance(item[1], Future) else item[1]
+            self.zipf.fp.write(data)
+            self._compress_size += len(data)
+            # progress follows what actually reached the archive, so big files move it too
+            if on_bytes:
+                on_bytes(item[2])
+            return 1
+
+        _, zinfo, crc, size = item
+        self._end_entry(zinfo, crc, size)
+        return 0
+
+    # These two mirror ZipFile._open_to_write / _ZipWriteFile.close, which have no public
+    # hook for writing data that is already deflated.
+
+    def _begin_entry(self, zinfo: zipfile.ZipInfo):
+        zipf = self.zipf
+        zinfo.compress_size = 0
+        zinfo.CRC = 0
+        zinfo.flag_bits = 0x00
+
+        self._zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+        self._compress_size = 0
+
+        zipf.fp.seek(zipf.start_dir)
+        zinfo.header_offset = zipf.fp.tell()
+        zipf._writecheck(zinfo)
+        zipf._didModify = True
+        zipf.fp.write(zinfo.FileHeader(self._zip64))
+
+    def _end_entry(self, zinfo: zipfile.ZipInfo, crc: int, size: int):
+        zipf = self.zipf
+        zinfo.CRC = crc
+        zinfo.file_size = size
+        zinfo.compress_size = self._compress_size
+
+        if not self._zip64 and (size > zipfile.ZIP64_LIMIT or self._compress_size > zipfile.ZIP64_LIMIT):
+            raise RuntimeError(f"{zinfo.filename} grew past the zip64 limit while being archived")
+
+        zipf.start_dir = zipf.fp.tell()
+        zipf.fp.seek(zinfo.header_offset)
+        zipf.fp.write(zinfo.FileHeader(self._zip64))
+        zipf.fp.seek(zipf.start_dir)
+
+        zipf.filelist.append(zinfo)
+        zipf.NameToInfo[zinfo.filename] = zinfo
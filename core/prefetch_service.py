@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from typing import Callable, List, Dict, Optional
+
+from core.cache_service import CacheService
+from core.download_manager import DownloadManager
+from core.file_utils import FileUtils
+from core.steam import SteamService
+
+class PrefetchService:
+    DEFAULT_RATE = 5
+    DEFAULT_MAX_IN_FLIGHT = 4
+    SAVE_EVERY = 20
+
+    def __init__(self, cache: CacheService, steam: SteamService, downloads: DownloadManager,
+                 rate: float = DEFAULT_RATE, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.cache = cache
+        self.steam = steam
+        self.downloads = downloads
+        self.rate = max(0.1, rate)
+        self.max_in_flight = max(1, max_in_flight)
+
+        # game id -> when to look again: 0 once hero and logo are cached, otherwise the
+        # expiry of the missing-artwork entries that settled it; persisted so a restart
+        # picks up where the last run stopped
+        self._state_path = FileUtils.get_cache_dir() / "prefetch.json"
+        self._done = self._load_state()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _load_state(self) -> dict:
+        if not self._state_path.exists(): return {}
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                done = json.load(f).get("done", {})
+            # older state files kept a plain list of ids; only fully cached games
+            # can be trusted from those, so they are all checked once more
+            if isinstance(done, list): return {}
+            now = time.time()
+            return {game_id: until for game_id, until in done.items() if not until or until > now}
+        except Exception:
+            return {}
+
+    def _save_state(self):
+        with self._lock:
+            data = json.dumps({"done": self._done}, sort_keys=True).encode("utf-8")
+        try:
+            FileUtils.write_atomic(self._state_path, [data])
+        except Exception as e:
+            print(f"[Prefetch] Cannot save state: {e}")
+
+    def _asset_urls(self, steam_id: str) -> Dict[str, str]:
+        return {
+            "hero": self.steam.get_hero_url(steam_id),
+            "logo": self.steam.get_logo_url(steam_id)
+        }
+
+    def _settled_until(self, game_id: str, urls: Dict[str, str]) -> Optional[float]:
+        # None while something can still be fetched, 0 when everything is cached,
+        # else the earliest time a missing asset should be asked for again
+        until = 0
+        for category, url in urls.items():
+            if self.cache.has_cached(category, game_id): continue
+            missing = self.cache.missing_until(url)
+            if missing is None: return None
+            until = min(until, missing) if until else missing
+        return until
+
+    def _is_done(self, game_id: str) -> bool:
+        until = self._done.get(game_id)
+        return until is not None and (not until or until > time.time())
+
+    def start(self, games: List[Dict], on_progress: Callable[[int, int], None]) -> bool:
+        with self._lock:
+            if self._running: return False
+            self._running = True
+
+        threading.Thread(target=self._run, args=(list(games), on_progress), daemon=True).start()
+        return True
+
+    def _run(self, games: List[Dict], on_progress: Callable[[int, int], None]):
+        try:
+            todo = {}
+            for game in games:
+                game_id = str(game['id'])
+                steam_id = game.get('steam_id')
+                if steam_id and str(steam_id) != "None" and not self._is_done(game_id):
+                    todo.setdefault(game_id, str(steam_id))
+
+            total = len(todo)
+            if not total: return
+
+            print(f"[Prefetch] Warming artwork for {total} games")
+            completed = 0
+            in_flight = threading.BoundedSemaphore(self.max_in_flight)
+            interval = 1.0 / self.rate
+            next_slot = time.monotonic()
+            finished = threading.Event()
+
+            def finish_game(game_id: str, urls: Dict[str, str]):
+                nonlocal completed
+                until = self._settled_until(game_id, urls)
+                with self._lock:
+                    # failed downloads stay out of the done map and are retried next run
+                    if until is not None:
+                        self._done[game_id] = until
+                    completed += 1
+                    current = completed
+                if current == total:
+                    finished.set()
+                on_progress(current, total)
+                if current % self.SAVE_EVERY == 0:
+                    self._save_state()
+
+            for game_id, steam_id in todo.items():
+                urls = self._asset_urls(steam_id)
+                jobs = []
+
+                for category, url in urls.items():
+                    if self.cache.has_cached(category, game_id) or self.cache.is_known_missing(url):
+                        continue
+
+                    # rate limit, then cap how many requests we have out at once
+                    delay = next_slot - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_slot = max(time.monotonic(), next_slot) + interval
+
+                    in_flight.acquire()
+                    future = self.downloads.submit(category, game_id, url, DownloadManager.PRIORITY_PREFETCH)
+                    future.add_done_callback(lambda _: in_flight.release())
+                    jobs.append(future)
+
+                if not jobs:
+                    finish_game(game_id, urls)
+                    continue
+
+                remaining = [len(jobs)]
+                def on_job_done(_, game_id=game_id, urls=urls, remaining=remaining):
+                    with self._lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last:
+                        finish_game(game_id, urls)
+
+                for future in jobs:
+                    future.add_done_callback(on_job_done)
+
+            # waiting on the futures alone could return before their callbacks record the game
+            finished.wait()
+            print("[Prefetch] Done")
+        except Exception as e:
+            print(f"[Prefetch] Error: {e}")
+        finally:
+            self._save_state()
+            with self._lock:
+                self._running = False
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+class ProcessMonitor:
+    WAIT_SLICE = 1.0
+    DISCOVERY_INTERVAL = 1.0
+
+    def __init__(self):
+        # one thread for every launched game: it blocks on the process handles
+        # (psutil.wait_procs) instead of sleeping and re-checking each one
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._watched: Dict[psutil.Process, dict] = {}
+        self._pending: List[dict] = []
+        self._thread = None
+
+    def watch(self, proc: psutil.Process, on_exit: Callable[[], None], install_path: str = None):
+        # with install_path set, exit only counts once nothing from that folder is left
+        # running (a launcher that hands over to the real game exe, say)
+        with self._lock:
+            self._watched[proc] = {"on_exit": on_exit, "on_found": None, "root": self._normalize(install_path)}
+        self._start()
+
+    def watch_launch(self, install_path: str, on_found: Callable[[psutil.Process], None],
+                     on_exit: Callable[[], None], timeout: float = 30):
+        # for launches we don't own (steam://run): wait for a process whose exe lives
+        # under install_path, then watch it like any other
+        with self._lock:
+            self._pending.append({
+                "root": self._normalize(install_path),
+                "deadline": time.monotonic() + timeout,
+                "on_found": on_found,
+                "on_exit": on_exit
+            })
+        self._start()
+
+    def _start(self):
+        self._wakeup.set()
+        with self._lock:
+            if self._thread and self._thread.is_alive(): return
+            self._thread = threading.Thread(target=self._run, name="process-monitor", daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _normalize(path: Optional[str]) -> Optional[str]:
+        if not path: return None
+        return os.path.normcase(os.path.abspath(path)).rstrip("\\/") + os.sep
+
+    def _find_under(self, root: str, exclude=()) -> Optional[psutil.Process]:
+        for proc in psutil.process_iter(['exe']):
+            exe = proc.info.get('exe')
+            if exe and proc not in exclude and os.path.normcase(exe).startswith(root):
+                return proc
+        return None
+
+    def _run(self):
+        while True:
+            with self._lock:
+                procs = list(self._watched)
+                pending = list(self._pending)
+
+            if not procs and not pending:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+
+            if pending:
+                self._discover(pending)
+
+            if procs:
+                # returns as soon as a handle signals; the slice only bounds how
+                # long new registrations wait to be picked up
+                psutil.wait_procs(procs, timeout=self.WAIT_SLICE, callback=self._on_gone)
+            else:
+                self._wakeup.wait(self.DISCOVERY_INTERVAL)
+                self._wakeup.clear()
+
+    def _discover(self, pending: List[dict]):
+        now = time.monotonic()
+        for entry in pending:
+            proc = self._find_under(entry["root"])
+            if not proc and now < entry["deadline"]:
+                continue
+
+            with self._lock:
+                self._pending.remove(entry)
+                if proc:
+                    self._watched[proc] = {"on_exit": entry["on_exit"], "on_found": entry["on_found"], "root": entry["root"]}
+
+            if proc:
+                entry["on_found"](proc)
+            else:
+                entry["on_exit"]()
+
+    def _on_gone(self, proc: psutil.Process):
+        with self._lock:
+            entry = self._watched.pop(proc, None)
+        if not entry: return
+
+        successor = self._find_under(entry["root"], exclude=(proc,)) if entry["root"] else None
+        if successor:
+            with self._lock:
+                self._watched[successor] = entry
+            if entry["on_found"]:
+                entry["on_found"](successor)
+            return
+
+        entry["on_exit"]()
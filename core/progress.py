@@ -0,0 +1,51 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from core.file_utils import FileUtils
+
+class ProgressTracker:
+    MIN_INTERVAL = 0.1
+
+    def __init__(self, total_bytes: int, callback: Callable[[dict], None], min_interval: float = MIN_INTERVAL):
+        self.total = max(0, total_bytes)
+        self.done = 0
+        self.callback = callback
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_report = 0.0
+
+    def advance(self, n: int):
+        with self._lock:
+            self.done += n
+            now = time.monotonic()
+            # throttled: thousands of tiny files must not mean thousands of UI updates
+            if now - self._last_report < self.min_interval: return
+            self._last_report = now
+            stats = self._stats(now)
+        self.callback(stats)
+
+    def finish(self):
+        with self._lock:
+            self.done = max(self.done, self.total)
+            stats = self._stats(time.monotonic())
+        self.callback(stats)
+
+    def _stats(self, now: float) -> dict:
+        elapsed = max(now - self._start, 1e-6)
+        speed = self.done / elapsed
+
+        eta: Optional[int] = None
+        if speed > 0 and self.total:
+            eta = int(max(self.total - self.done, 0) / speed)
+
+        percent = (self.done / self.total) * 100 if self.total else 100.0
+        return {
+            "percent": min(percent, 100.0),
+            "bytes_done": self.done,
+            "bytes_total": self.total,
+            "speed": f"{FileUtils.format_size(speed)}/s",
+            "eta": eta
+        }
@@ -6,11 +6,21 @@ from typing import List, Optional, Dict
 from core.steam import SteamService
 
 class PathResolver:
+    GAME_PLACEHOLDER = "{{p|game}}"
+
     def __init__(self, steam_service: SteamService):
         self.steam = steam_service
         self.user_context = self.steam.get_active_user_context()
         self.system_paths = self._get_system_paths()
 
+        # every placeholder in one alternation, so a template is rewritten in a single pass
+        self._values = {k.lower(): v for k, v in self.system_paths.items() if v}
+        placeholders = sorted([*self._values, self.GAME_PLACEHOLDER], key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(p) for p in placeholders))
+
+        # (template, game_path, follow_links) -> resolved path; scans resolve the same templates over and over
+        self._memo: Dict[tuple, str] = {}
+
     def _get_system_paths(self) -> Dict[str, str]:
         user_profile = Path.home()
         appdata = os.getenv("APPDATA")
@@ -35,21 +45,33 @@ class PathResolver:
             "{{p|hexuid}}": hex_uid
         }
 
-    def resolve(self, template: str, game_path: Optional[Path] = None) -> str:
+    def resolve(self, template: str, game_path: Optional[Path] = None, follow_links: bool = False) -> str:
         if not template: return ""
-        
-        path_str = template.lower()
-        
-        for placeholder, value in self.system_paths.items():
-            if value:
-                path_str = path_str.replace(placeholder.lower(), value)
 
-        if game_path:
-            path_str = path_str.replace("{{p|game}}", str(game_path))
+        key = (template, str(game_path) if game_path else None, follow_links)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        game = str(game_path) if game_path else None
+
+        def substitute(match):
+            placeholder = match.group(0)
+            if placeholder == self.GAME_PLACEHOLDER:
+                return game if game else placeholder
+            return self._values[placeholder]
+
+        path_str = self._pattern.sub(substitute, template.lower())
 
         try:
             path_str = os.path.expandvars(path_str)
-            resolved_path = Path(path_str).resolve()
-            return str(resolved_path)
+            if follow_links:
+                # touches the disk (symlinks, junctions); only for callers that need the real path
+                path_str = str(Path(path_str).resolve())
+            else:
+                path_str = os.path.normpath(os.path.abspath(path_str))
         except Exception:
-            return path_str
\ No newline at end of file
+            pass
+
+        self._memo[key] = path_str
+        return path_str
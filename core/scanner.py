@@ -1,20 +1,32 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterator, Callable
 from pathlib import Path
 import sqlite3
 import json
+import math
+import queue
+import threading
+import time
 
 from core.config import ConfigService
 from core.resolver import PathResolver
 from core.steam import SteamService
 from core.file_utils import FileUtils
+from core.icon_service import IconService
 
 class GameScanner:
+    DEFAULT_SCAN_WORKERS = 4
+    DEFAULT_ROOT_TIMEOUT = 30
+
     def __init__(self, steam: SteamService, config: ConfigService, resolver: PathResolver):
         self.steam = steam
         self.config = config
         self.resolver = resolver
         self.db_path = FileUtils.get_app_dir() / "database.db"
 
+        self._alias_index: Dict[str, dict] = {}
+        self._appid_index: Dict[str, dict] = {}
+        self._alias_index_mtime: Optional[float] = None
+
     def _query_db(self, field: str, value: str) -> Optional[dict]:
         try:
             with sqlite3.connect(self.db_path) as conn:
@@ -37,52 +49,200 @@ class GameScanner:
             print(f"[DataBase] Error: {e}")
             return None
 
-    def scan_all(self) -> List[Dict]:
-        games = []
-        
-        all_db_games = []
-        
+    def get_db_mtime(self) -> Optional[float]:
+        try:
+            return self.db_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _get_alias_index(self) -> Dict[str, dict]:
+        mtime = self.get_db_mtime()
+
+        if mtime is not None and mtime == self._alias_index_mtime:
+            return self._alias_index
+
+        index = {}
+        appid_index = {}
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
-                all_db_games = [dict(r) for r in conn.execute("SELECT * FROM GAMES")]
+                for r in conn.execute("SELECT * FROM GAMES"):
+                    row = dict(r)
+                    if row['steam_id']:
+                        appid_index.setdefault(str(row['steam_id']), row)
+                    for alias in (row['install_folder'] or "").split(';'):
+                        alias = alias.strip()
+                        if alias:
+                            # first row wins, same as the old linear search
+                            index.setdefault(alias, row)
         except Exception as e:
             print(f"[DataBase] Load Error: {e}")
-            
-        def find_game_in_db(folder_name):
-            for g in all_db_games:
-                aliases = [a.strip() for a in (g['install_folder'] or "").split(';') if a.strip()]
-                if folder_name in aliases:
-                    return g
-            return None
+            return self._alias_index
+
+        self._alias_index = index
+        self._appid_index = appid_index
+        self._alias_index_mtime = mtime
+        return index
 
-        # steam
+    def _get_appid_index(self) -> Dict[str, dict]:
+        self._get_alias_index()
+        return self._appid_index
+
+    def get_library_roots(self) -> List[Tuple[Path, str]]:
+        roots = []
         for lib in self.steam.get_library_paths():
-            common_dir = lib / "steamapps" / "common"
-            if not common_dir.exists(): continue
-            
-            for folder in common_dir.iterdir():
-                if folder.is_dir():
-                    game_data = find_game_in_db(folder.name)
-                    if game_data:
-                        if self._is_really_installed(folder, game_data["steam_id"]):
-                            games.append(self._format_game(game_data, folder, 'steam'))
-
-        # local games
+            roots.append((lib / "steamapps" / "common", 'steam'))
+
         for path_str in self.config.get("non_steam_paths", []):
-            local_path = Path(path_str)
-            if not local_path.exists(): continue
-            
-            for folder in local_path.iterdir():
-                if folder.is_dir():
-                    game_data = find_game_in_db(folder.name)
-                    if game_data:
-                        if self._is_really_installed(folder):
-                            games.append(self._format_game(game_data, folder, 'local'))
-        
+            roots.append((Path(path_str), 'local'))
+
+        return roots
+
+    def iter_root(self, root: Path, source: str) -> Iterator[Dict]:
+        if not root.exists(): return
+
+        if source == 'steam':
+            yield from self._iter_steam_root(root)
+            return
+
+        alias_index = self._get_alias_index()
+
+        for folder in sorted(root.iterdir(), key=lambda p: p.name.lower()):
+            if not folder.is_dir(): continue
+
+            game_data = alias_index.get(folder.name)
+            if not game_data: continue
+
+            if self._is_really_installed(folder):
+                yield self._format_game(game_data, folder, source)
+
+    def _iter_steam_root(self, root: Path) -> Iterator[Dict]:
+        # Steam's appmanifests say what is installed and where, so match by appid
+        # instead of folder name; a renamed folder is still found
+        appid_index = self._get_appid_index()
+        apps = self.steam.get_installed_apps(root.parent)
+
+        for appid, app in sorted(apps.items(), key=lambda a: a[1]["installdir"].lower()):
+            game_data = appid_index.get(appid)
+            if not game_data: continue
+
+            folder = root / app["installdir"]
+            if folder.is_dir():
+                yield self._format_game(game_data, folder, 'steam', app)
+
+    def scan_root(self, root: Path, source: str) -> List[Dict]:
+        return list(self.iter_root(root, source))
+
+    def iter_scan(self, roots: List[Tuple[Path, str]],
+                  skip: Optional[Callable[[int, Path, str], bool]] = None) -> Iterator[Tuple[int, str, Optional[Dict]]]:
+        # yields (root_index, event, game) as the workers make progress, where event is
+        # 'game', 'done', 'unchanged', 'failed' or 'timeout'; every root ends with exactly
+        # one non-'game' event. skip(i, root, source) runs on the worker, under the root's
+        # timeout, and a True answer ends the root as 'unchanged' without scanning it
+        if not roots: return
+
+        workers = max(1, int(self.config.get("scan_workers", self.DEFAULT_SCAN_WORKERS)))
+        workers = min(workers, len(roots))
+        timeout = float(self.config.get("scan_root_timeout", self.DEFAULT_ROOT_TIMEOUT))
+
+        # load once up front so the workers don't race to rebuild it
+        self._get_alias_index()
+
+        events: queue.Queue = queue.Queue()
+        started: Dict[int, float] = {}
+
+        def run(i: int, root: Path, source: str):
+            started[i] = time.monotonic()
+            try:
+                if skip and skip(i, root, source):
+                    events.put((i, 'unchanged', None))
+                    return
+                for game in self.iter_root(root, source):
+                    events.put((i, 'game', game))
+                events.put((i, 'done', None))
+            except Exception as e:
+                print(f"[Scanner] Error scanning {root}: {e}")
+                events.put((i, 'failed', None))
+
+        # a hung share keeps its worker busy, so roots still queued behind it
+        # get a deadline for the whole batch instead of waiting forever
+        scan_start = time.monotonic()
+        batch_deadline = timeout * math.ceil(len(roots) / workers)
+
+        # plain daemon threads, not an executor: executor workers are joined at interpreter
+        # exit, so one stuck on a dead share would keep the app from closing
+        todo: queue.Queue = queue.Queue()
+        for i, (root, source) in enumerate(roots):
+            todo.put((i, root, source))
+        stopped = threading.Event()
+
+        def worker():
+            while not stopped.is_set():
+                try:
+                    job = todo.get_nowait()
+                except queue.Empty:
+                    return
+                run(*job)
+
+        for n in range(workers):
+            threading.Thread(target=worker, name=f"scanner-{n}", daemon=True).start()
+
+        outstanding = set(range(len(roots)))
+        try:
+            while outstanding:
+                try:
+                    i, event, game = events.get(timeout=0.25)
+                    # late events from a root we already gave up on are dropped
+                    if i in outstanding:
+                        if event != 'game':
+                            outstanding.discard(i)
+                        yield i, event, game
+                except queue.Empty:
+                    pass
+
+                now = time.monotonic()
+                for i in list(outstanding):
+                    if i in started:
+                        expired = now - started[i] > timeout
+                    else:
+                        expired = now - scan_start > batch_deadline
+                    if expired:
+                        print(f"[Scanner] Timed out scanning {roots[i][0]}")
+                        outstanding.discard(i)
+                        yield i, 'timeout', None
+        finally:
+            # roots not started yet are dropped; a stuck one is simply left behind
+            stopped.set()
+
+    def iter_games(self, roots: Optional[List[Tuple[Path, str]]] = None) -> Iterator[Dict]:
+        if roots is None:
+            roots = self.get_library_roots()
+
+        for _, event, game in self.iter_scan(roots):
+            if event == 'game':
+                yield game
+
+    def scan_roots(self, roots: List[Tuple[Path, str]]) -> List[Optional[List[Dict]]]:
+        # results keep the order of `roots`; None means the root failed or timed out
+        results: List[Optional[List[Dict]]] = [None] * len(roots)
+        partial: Dict[int, List[Dict]] = {i: [] for i in range(len(roots))}
+
+        for i, event, game in self.iter_scan(roots):
+            if event == 'game':
+                partial[i].append(game)
+            elif event == 'done':
+                results[i] = partial[i]
+
+        return results
+
+    def scan_all(self) -> List[Dict]:
+        games = []
+        for result in self.scan_roots(self.get_library_roots()):
+            if result:
+                games.extend(result)
         return games
         
-    def _format_game(self, db_data: dict, folder: Path, source: str) -> dict:
+    def _format_game(self, db_data: dict, folder: Path, source: str, manifest: Optional[dict] = None) -> dict:
         save_data = json.loads(db_data["save_location"])
         win_templates = save_data.get("win", [])
         resolved_saves = [self.resolver.resolve(t, folder) for t in win_templates]
@@ -94,80 +254,16 @@ class GameScanner:
             "install_path": str(folder),
             "save_paths": resolved_saves,
             "source": source,
-            "local_icon": None 
+            "local_icon": None,
+            "install_size": manifest["size_on_disk"] if manifest else None,
+            "last_updated": manifest["last_updated"] if manifest else None
         } 
     
     def extract_icon_manually(self, game_install_path: str) -> bytes | None:
-        folder = Path(game_install_path)
-        if not folder.exists(): return None
-
-        all_exes = []
-        try:
-            all_exes.extend([x for x in folder.iterdir() if x.is_file() and x.name.lower().endswith('.exe')])
-            for p in folder.rglob("*.exe"):
-                depth = len(p.parts) - len(folder.parts)
-                if 1 <= depth <= 5:
-                    if p not in all_exes: all_exes.append(p)
-        except: pass
-
-        if not all_exes: return None
-
-        candidates = []
-        for exe in all_exes:
-            score = self._score_exe_candidate(exe, folder)
-            if score > 0:
-                candidates.append((exe, score))
-
-        candidates.sort(key=lambda x: x[1], reverse=True)
-
-        for exe_path, score in candidates:
-            icon_data = FileUtils.extract_icon_to_bytes(str(exe_path))
-            if icon_data:
-                return icon_data
-
-        return None
-
-    def _score_exe_candidate(self, exe: Path, game_root: Path) -> int:
-        score = 0
-        name = exe.name.lower()
-        
-        BLACKLIST = [
-            "unins", "setup", "helper", "crash", "report", "config", "tool", "7za",
-            "dxwebsetup", "vcredist", "launcher", "steam_cleaner", "easyanticheat",
-            "touchup", "cleanup", "activation", "redist", "overlay", "physx", "start_protected_game"
-        ]
-        if any(bad in name for bad in BLACKLIST):
-            return -100
-
-        try:
-            size_mb = exe.stat().st_size / (1024 * 1024)
-        except: return -100
-
-        if 15 < size_mb < 500: score += 50
-        elif 2 < size_mb <= 15: score += 20
-        elif 0.2 < size_mb <=5: score += 3
-        
-        clean_folder_name = "".join(filter(str.isalnum, game_root.name.lower()))
-        clean_exe_name = "".join(filter(str.isalnum, exe.stem.lower()))
-        
-        if clean_exe_name == clean_folder_name:
-            score += 100
-        elif clean_exe_name in clean_folder_name or clean_folder_name in clean_exe_name:
-            score += 40
-
-        path_str = str(exe).lower()
-        if "bin" in path_str or "win64" in path_str or "shipping" in path_str:
-            score += 30
-
-        return score
+        _, icon_data = IconService.extract_from_folder(game_install_path)
+        return icon_data
     
-    def _is_really_installed(self, folder: Path, steam_id: str = None) -> bool:
-        if steam_id:
-            manifest_path = folder.parent.parent / f"appmanifest_{steam_id}.acf"
-            if manifest_path.exists():
-                return True
-            return False
-
+    def _is_really_installed(self, folder: Path) -> bool:
         try:
             exes = list(folder.glob("*.exe")) + list(folder.glob("*/*.exe"))
             if exes:
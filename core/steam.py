@@ -1,16 +1,25 @@
 import datetime
 import re
-import winreg
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-import requests
+from typing import Optional, List, Dict, Any, Tuple
 import vdf
 
+NEWS_IMAGE_RE = re.compile(r'(https?://[^\s"]+\.(?:png|jpg|jpeg|gif))')
+NEWS_SRC_RE = re.compile(r'src="([^"]+)"')
+NEWS_TAG_RE = re.compile(r'<[^<]+?>')
+
 class SteamService:
-    def __init__(self):
-        self.install_path = self._get_install_path()
+    def __init__(self, install_path: Optional[Path] = None):
+        # an explicit root skips the registry, e.g. a fake Steam dir in tests
+        self.install_path = Path(install_path) if install_path else self._get_install_path()
+
+        # path -> ((mtime_ns, size), parsed data); reparsed only when Steam rewrites the file
+        self._vdf_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self._vdf_lock = threading.Lock()
 
     def _get_install_path(self) -> Optional[Path]:
+        import winreg
         for key_path in [r"SOFTWARE\WOW6432Node\Valve\Steam", r"SOFTWARE\Valve\Steam"]:
             try:
                 with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
@@ -20,80 +29,112 @@ class SteamService:
                 continue
         return None
 
+    def _load_vdf(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            stats = path.stat()
+        except OSError:
+            return None
+        signature = (stats.st_mtime_ns, stats.st_size)
+
+        with self._vdf_lock:
+            cached = self._vdf_cache.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = vdf.load(f)
+
+        with self._vdf_lock:
+            self._vdf_cache[path] = (signature, data)
+        return data
+
     def get_library_paths(self) -> List[Path]:
         if not self.install_path: return []
         
-        vdf_path = self.install_path / "steamapps" / "libraryfolders.vdf"
-        if not vdf_path.exists(): return []
+        data = self._load_vdf(self.install_path / "steamapps" / "libraryfolders.vdf")
+        if not data: return []
 
-        with open(vdf_path, "r", encoding="utf-8") as f:
-            data = vdf.load(f)
-            return [Path(val["path"]) for val in data.get("libraryfolders", {}).values() if "path" in val]
+        return [Path(val["path"]) for val in data.get("libraryfolders", {}).values() if "path" in val]
+
+    def get_installed_apps(self, steamapps: Path) -> Dict[str, Dict[str, Any]]:
+        # appid -> what Steam's own appmanifest says about it; each manifest is
+        # memoized, so a rescan only re-reads the ones Steam touched
+        apps = {}
+        try:
+            manifests = list(steamapps.glob("appmanifest_*.acf"))
+        except OSError:
+            return apps
+
+        for manifest in manifests:
+            try:
+                state = (self._load_vdf(manifest) or {}).get("AppState", {})
+            except Exception as e:
+                print(f"[SteamService] Cannot parse {manifest.name}: {e}")
+                continue
+
+            appid = str(state.get("appid", ""))
+            installdir = state.get("installdir")
+            if not appid or not installdir: continue
+
+            apps[appid] = {
+                "installdir": installdir,
+                "size_on_disk": int(state.get("SizeOnDisk", 0) or 0),
+                "last_updated": int(state.get("LastUpdated", 0) or 0),
+                "state_flags": int(state.get("StateFlags", 0) or 0)
+            }
+        return apps
 
     def get_active_user_context(self) -> Dict[str, str]:
         context = {"uid": "", "uid_short": "", "account_name": ""}
         if not self.install_path: return context
 
-        login_vdf = self.install_path / "config" / "loginusers.vdf"
-        if not login_vdf.exists(): return context
-
-        with open(login_vdf, "r", encoding="utf-8") as f:
-            users = vdf.load(f).get("users", {})
-            for uid, info in users.items():
-                if info.get("MostRecent") == "1":
-                    context["uid"] = uid
-                    context["uid_short"] = str(int(uid) & 0xFFFFFFFF)
-                    context["account_name"] = info.get("AccountName", "")
-                    break
+        data = self._load_vdf(self.install_path / "config" / "loginusers.vdf")
+        if not data: return context
+
+        users = data.get("users", {})
+        for uid, info in users.items():
+            if info.get("MostRecent") == "1":
+                context["uid"] = uid
+                context["uid_short"] = str(int(uid) & 0xFFFFFFFF)
+                context["account_name"] = info.get("AccountName", "")
+                break
         return context
     
-    def get_game_news(self, steam_id: str) -> List[Dict[str, Any]]:
-        if not steam_id or str(steam_id) == "None":
-            return []
+    def get_news_url(self, steam_id: str) -> str:
+        return f"http://api.steampowered.com/ISteamNews/GetNewsForApp/v0002/?appid={steam_id}&count=5&maxlength=300&format=json"
 
-        try:
-            url = f"http://api.steampowered.com/ISteamNews/GetNewsForApp/v0002/?appid={steam_id}&count=5&maxlength=300&format=json"
+    @staticmethod
+    def parse_news(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        news_items = []
+        
+        for item in data.get('appnews', {}).get('newsitems', []):
+            date_str = datetime.datetime.fromtimestamp(item['date']).strftime('%d.%m.%Y')
+            raw_content = item.get('contents', '')
             
-            response = requests.get(url, timeout=3)
+            image_url = None
+            img_match = NEWS_IMAGE_RE.search(raw_content)
             
-            if response.status_code != 200:
-                return []
-
-            data = response.json()
-            news_items = []
+            if img_match: image_url = img_match.group(1)
+            elif 'src="' in raw_content:
+                src_match = NEWS_SRC_RE.search(raw_content)
+                if src_match:
+                    image_url = src_match.group(1)
             
-            for item in data.get('appnews', {}).get('newsitems', []):
-                date_str = datetime.datetime.fromtimestamp(item['date']).strftime('%d.%m.%Y')
-                raw_content = item.get('contents', '')
-                
-                image_url = None
-                img_match = re.search(r'(https?://[^\s"]+\.(?:png|jpg|jpeg|gif))', raw_content)
-                
-                if img_match: image_url = img_match.group(1)
-                elif 'src="' in raw_content:
-                    src_match = re.search(r'src="([^"]+)"', raw_content)
-                    if src_match:
-                        image_url = src_match.group(1)
-                
-                clean_text = re.sub(r'<[^<]+?>', '', raw_content)
-                if image_url: clean_text = clean_text.replace(image_url, '')
-                clean_text = clean_text.strip()
-                
-                news_items.append({
-                    "title": item['title'],
-                    "url": item['url'],
-                    "author": item.get('feedlabel', 'Steam'),
-                    "date": date_str,
-                    "contents": clean_text.strip() + "...",
-                    "image": image_url
-                })
-                
-            return news_items
+            clean_text = NEWS_TAG_RE.sub('', raw_content)
+            if image_url: clean_text = clean_text.replace(image_url, '')
+            clean_text = clean_text.strip()
             
-        except Exception as e:
-            print(f"[SteamService] Error fetching news for {steam_id}: {e}")
-            return []
-        
+            news_items.append({
+                "title": item['title'],
+                "url": item['url'],
+                "author": item.get('feedlabel', 'Steam'),
+                "date": date_str,
+                "contents": clean_text.strip() + "...",
+                "image": image_url
+            })
+            
+        return news_items
+
     def get_hero_url(self, steam_id: str) -> str:
         return f"https://cdn.cloudflare.steamstatic.com/steam/apps/{steam_id}/library_hero.jpg"
 
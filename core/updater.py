@@ -1,10 +1,26 @@
+import hashlib
+import json
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
 import requests
 
 from core.file_utils import FileUtils
+from core.progress import ProgressTracker
 
 class UpdaterService:
     GITHUB_API_URL = "https://api.github.com/repos/fanteeek/GameVault/releases"
+    LATEST_RELEASE_URL = f"{GITHUB_API_URL}/latest"
+    CHECK_CACHE = "update_check.json"
+    MIN_RECHECK_INTERVAL = 6 * 60 * 60
+    DOWNLOAD_WORKERS = 4
+    MIN_SEGMENT = 8 * 1024 * 1024
+    CHUNK_SIZE = 256 * 1024
+    RETRIES = 4
+    TIMEOUT = (10, 30)
 
     @staticmethod
     def version_to_tuple(v):
@@ -18,58 +34,105 @@ class UpdaterService:
             return (0, 0, 0)
 
     @staticmethod
-    def check_for_updates(current_version):
+    def _load_check_cache() -> dict:
+        path = FileUtils.get_cache_dir() / UpdaterService.CHECK_CACHE
+        if not path.exists(): return {}
         try:
-            response = requests.get(UpdaterService.GITHUB_API_URL, timeout=5)
-            if response.status_code == 200:
-                releases = response.json()
-                if not releases:
-                    return {"update_available": False}
-                
-                latest_release = releases[0]
-                latest_version = latest_release['tag_name']
-                
-                
-                v_latest = UpdaterService.version_to_tuple(latest_version)
-                v_current = UpdaterService.version_to_tuple(current_version)
-                
-                if v_latest > v_current:
-                    download_url = None
-                    for asset in latest_release.get('assets', []):
-                        if asset['name'].endswith('.exe'):
-                            download_url = asset['browser_download_url']
-                            break
-                        
-                    if download_url:
-                        return {
-                            "update_available": True,
-                            "latest_version": latest_version,
-                            "download_url": download_url,
-                            "changelog": latest_release.get('body', '')
-                        }
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _save_check_cache(cache: dict):
+        try:
+            FileUtils.write_atomic(FileUtils.get_cache_dir() / UpdaterService.CHECK_CACHE,
+                                   [json.dumps(cache, ensure_ascii=False).encode("utf-8")])
         except Exception as e:
+            print(f"[Updater] Cannot save check cache: {e}")
+
+    @staticmethod
+    def _fetch_latest_release(cache: dict) -> Optional[dict]:
+        # conditional request: an unchanged release costs a 304 and no rate limit
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache.get("etag"): headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"): headers["If-Modified-Since"] = cache["last_modified"]
+
+        response = requests.get(UpdaterService.LATEST_RELEASE_URL, headers=headers, timeout=5)
+        if response.status_code == 304 and cache.get("release"):
+            release = cache["release"]
+        elif response.status_code == 200:
+            data = response.json()
+            # keep only what _evaluate needs, not every asset's full record
+            release = {
+                "tag_name": data.get("tag_name", ""),
+                "body": data.get("body", ""),
+                "assets": [{k: a.get(k) for k in ("name", "browser_download_url", "digest", "size")}
+                           for a in data.get("assets", [])]
+            }
+        else:
+            print(f"[Updater] Release check returned {response.status_code}")
+            return cache.get("release")
+
+        UpdaterService._save_check_cache({
+            "checked": time.time(),
+            "etag": response.headers.get("ETag") or cache.get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or cache.get("last_modified"),
+            "release": release
+        })
+        return release
+
+    @staticmethod
+    def check_for_updates(current_version, min_interval: float = MIN_RECHECK_INTERVAL):
+        cache = UpdaterService._load_check_cache()
+        release = cache.get("release")
+
+        try:
+            if not release or time.time() - cache.get("checked", 0) >= min_interval:
+                release = UpdaterService._fetch_latest_release(cache)
+        except Exception as e:
+            # offline: answer from the last release we saw
             print(f"Ошибка проверки обновлений: {e}")
+
+        if not release:
+            return {"update_available": False}
+        return UpdaterService._evaluate(release, current_version)
+
+    @staticmethod
+    def _evaluate(latest_release: dict, current_version) -> dict:
+        latest_version = latest_release['tag_name']
+        
+        v_latest = UpdaterService.version_to_tuple(latest_version)
+        v_current = UpdaterService.version_to_tuple(current_version)
+        
+        if v_latest > v_current:
+            installer = None
+            for asset in latest_release.get('assets', []):
+                if asset['name'].endswith('.exe'):
+                    installer = asset
+                    break
+                
+            if installer:
+                # GitHub publishes "sha256:<hex>" per asset; older releases may lack it
+                digest = installer.get('digest') or ''
+                return {
+                    "update_available": True,
+                    "latest_version": latest_version,
+                    "download_url": installer['browser_download_url'],
+                    "sha256": digest.partition(':')[2] if digest.startswith('sha256:') else None,
+                    "size": installer.get('size'),
+                    "changelog": latest_release.get('body', '')
+                }
         return {"update_available": False}
 
     @staticmethod
-    def install_update(download_url, progress_callback):
+    def install_update(download_url, progress_callback, sha256: Optional[str] = None, expected_size: Optional[int] = None):
         try:
             app_dir = FileUtils.get_app_dir()
             setup_path = app_dir / "GameVault_Setup.exe"
-            
-            response = requests.get(download_url, stream=True, allow_redirects=True)
-            total_size = int(response.headers.get('content-length', 0))
-            
-            downloaded = 0
-            with open(setup_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            progress_callback(percent)
-            
+
+            UpdaterService.download_installer(download_url, setup_path, progress_callback, sha256, expected_size)
+
             args = "/VERYSILENT /SP- /SUPPRESSMSGBOXES /NORESTART /NOCANCEL /CLOSEAPPLICATIONS /RESTARTAPPLICATIONS"
             cmd = f'cmd /c start "" "{setup_path}" {args}'
             subprocess.Popen(cmd, shell=True)
@@ -77,4 +140,111 @@ class UpdaterService:
         
         except Exception as e:
             print(f"Ошибка: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    # Installer download
+    # The file is fetched as one or more byte ranges, each into its own .part file, so an
+    # interrupted download picks up where every range stopped. Nothing is moved into place
+    # until the size and the release's sha256 check out.
+
+    @staticmethod
+    def _probe(session: requests.Session, url: str) -> Tuple[str, Optional[int], bool]:
+        # -> (final url after redirects, size, whether the server honours Range)
+        response = session.get(url, headers={"Range": "bytes=0-0"}, stream=True,
+                               allow_redirects=True, timeout=UpdaterService.TIMEOUT)
+        try:
+            if response.status_code == 206:
+                content_range = response.headers.get("Content-Range", "")
+                total = content_range.rpartition("/")[2]
+                return response.url, int(total) if total.isdigit() else None, True
+            response.raise_for_status()
+            length = response.headers.get("content-length")
+            return response.url, int(length) if length else None, False
+        finally:
+            response.close()
+
+    @staticmethod
+    def download_installer(download_url: str, target: Path, progress_callback: Callable[[float], None],
+                           sha256: Optional[str] = None, expected_size: Optional[int] = None,
+                           workers: int = DOWNLOAD_WORKERS) -> Path:
+        session = requests.Session()
+        url, total, ranged = UpdaterService._probe(session, download_url)
+        if expected_size and total and total != expected_size:
+            raise IOError(f"server reports {total} bytes, release says {expected_size}")
+        total = total or expected_size
+
+        if ranged and total:
+            count = max(1, min(workers, total // UpdaterService.MIN_SEGMENT))
+            step = -(-total // count)
+            segments = [(start, min(start + step, total) - 1) for start in range(0, total, step)]
+        else:
+            segments = [(0, None)]
+
+        # partial files from a different installer (or a different split) are useless
+        key = hashlib.sha256(f"{download_url}|{total}|{len(segments)}".encode()).hexdigest()[:12]
+        prefix = f"{target.name}.{key}."
+        for stale in target.parent.glob(f"{target.name}.*.part"):
+            if not stale.name.startswith(prefix):
+                stale.unlink()
+        parts = [target.with_name(f"{prefix}{i}.part") for i in range(len(segments))]
+
+        if not ranged:
+            # nothing to resume from without Range support
+            for part in parts:
+                if part.exists(): part.unlink()
+
+        tracker = ProgressTracker(total or 0, lambda stats: progress_callback(stats["percent"]))
+        tracker.done = sum(part.stat().st_size for part in parts if part.exists())
+
+        def fetch(i: int):
+            start, end = segments[i]
+            for attempt in range(UpdaterService.RETRIES):
+                have = parts[i].stat().st_size if parts[i].exists() else 0
+                if end is not None and have >= end - start + 1:
+                    return
+                headers = {}
+                if ranged:
+                    headers["Range"] = f"bytes={start + have}-{'' if end is None else end}"
+                try:
+                    with session.get(url, headers=headers, stream=True, timeout=UpdaterService.TIMEOUT) as response:
+                        response.raise_for_status()
+                        if ranged and response.status_code != 206:
+                            raise IOError("server ignored the range request")
+                        with open(parts[i], "ab" if ranged else "wb") as f:
+                            for chunk in response.iter_content(UpdaterService.CHUNK_SIZE):
+                                f.write(chunk)
+                                tracker.advance(len(chunk))
+                    if end is None: return
+                except (requests.RequestException, IOError) as e:
+                    print(f"[Updater] Range {i} interrupted ({e}), retrying")
+                    if attempt == UpdaterService.RETRIES - 1: raise
+                    time.sleep(2 ** attempt)
+
+        if len(segments) > 1:
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                list(pool.map(fetch, range(len(segments))))
+        else:
+            fetch(0)
+
+        def chunks():
+            for part in parts:
+                with open(part, "rb") as f:
+                    while chunk := f.read(UpdaterService.CHUNK_SIZE):
+                        yield chunk
+
+        try:
+            # verify the parts before anything is moved over the installer path
+            if sha256:
+                digest = hashlib.sha256()
+                for chunk in chunks():
+                    digest.update(chunk)
+                if digest.hexdigest() != sha256.lower():
+                    raise IOError("installer checksum does not match the release")
+            FileUtils.write_atomic(target, chunks(), total)
+        finally:
+            # a bad download must not be resumed, a good one is no longer needed
+            for part in parts:
+                if part.exists(): part.unlink()
+
+        tracker.finish()
+        return target
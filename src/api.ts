@@ -30,6 +30,11 @@ export const api = {
         return await window.pywebview.api.get_games();
     },
 
+    async streamGames(force: boolean = false): Promise<Game[]> {
+        if (!isPyWebViewReady()) return [];
+        return await window.pywebview.api.stream_games(force);
+    },
+
     async getGameDetails(gameId: string): Promise<any> {
         if (!isPyWebViewReady()) return null;
         return await window.pywebview.api.get_game_details(gameId);
@@ -69,6 +74,11 @@ export const api = {
         return await window.pywebview.api.delete_backup(filePath);
     },
 
+    async restoreBackup(filePath: string, gameId: string | null = null): Promise<any> {
+        if (!isPyWebViewReady()) return { status: 'simulated' };
+        return await window.pywebview.api.restore_backup(filePath, gameId);
+    },
+
     // Folders
 
     async openFolder(path: string): Promise<boolean> {
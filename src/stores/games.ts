@@ -13,6 +13,7 @@ export const useGamesStore = defineStore('games', () => {
     const activeGameNews = ref<GameNewsItem[]>([]);
     const isGameRunning = ref(false);
     const isLoading = ref(false);
+    const isScanning = ref(false);
 
     // GETTERS
 
@@ -27,20 +28,39 @@ export const useGamesStore = defineStore('games', () => {
     // ACTIONS
 
     // loadLibrary Games
-    async function loadLibrary() {
+    async function loadLibrary(force: boolean = false) {
+        // a rescan is still streaming in; finishScan clears the flag
+        if (isScanning.value) return;
         isLoading.value = true;
+        isScanning.value = true;
         try {
             console.log("Try get Games from Python...");
-            allGames.value = await api.getGames();
-            await new Promise(resolve => setTimeout(resolve, 300));
-            console.log("Games taken:", allGames.value.length);
+            // cached snapshot first, rescanned games arrive through UI.addGames
+            upsertGames(await api.streamGames(force));
+            console.log("Cached games taken:", allGames.value.length);
         } catch (e) {
             console.error("Failed to load games", e);
+            isScanning.value = false;
         } finally {
             isLoading.value = false;
         }
     }
 
+    function upsertGames(games: Game[]) {
+        for (const game of games) {
+            const index = allGames.value.findIndex(g => String(g.id) === String(game.id));
+            if (index === -1) allGames.value.push(game);
+            else allGames.value[index] = { ...allGames.value[index], ...game };
+        }
+    }
+
+    function finishScan(gameIds: string[]) {
+        const keep = new Set(gameIds.map(String));
+        allGames.value = allGames.value.filter(g => keep.has(String(g.id)));
+        isScanning.value = false;
+        console.log("Games taken:", allGames.value.length);
+    }
+
     // Load Dashboard
     async function loadDashboard() {
         try {
@@ -101,6 +121,19 @@ export const useGamesStore = defineStore('games', () => {
         }
     }
 
+    async function restoreBackup(path: string) {
+        if (!activeGameId.value) return;
+        // the save folders are rolled back to this backup, newer files included
+        if (!window.confirm("Restore this backup? Current saves will be replaced.")) return;
+
+        const result = await api.restoreBackup(path, activeGameId.value);
+        if (result?.status === 'error') {
+            console.error("Restore failed:", result.message);
+            window.alert(`Restore failed: ${result.message}`);
+        }
+        await selectGame(activeGameId.value);
+    }
+
     return {
         allGames,
         dashboardData,
@@ -111,13 +144,17 @@ export const useGamesStore = defineStore('games', () => {
         activeGameNews,
         isGameRunning,
         isLoading,
+        isScanning,
         steamGames,
         localGames,
         loadLibrary,
+        upsertGames,
+        finishScan,
         loadDashboard,
         selectGame,
         playActiveGame,
         createBackup,
-        deleteBackup
+        deleteBackup,
+        restoreBackup
     };
 });
\ No newline at end of file
@@ -1,6 +1,6 @@
 import { defineStore } from 'pinia';
 import { ref } from 'vue';
-import type { Game, Settings, UpdateInfo } from '../types';
+import type { Game, Settings, UpdateInfo, BackupProgressStats } from '../types';
 import api from '../api';
 import placeholderImg from '../assets/hero_placeholder.jpg';
 
@@ -34,6 +34,12 @@ export const useUiStore = defineStore('ui', () => {
     // Backup
     const isBackupRunning = ref(false);
     const backupProgress = ref(0);
+    const backupSpeed = ref<string | null>(null);
+    const backupEta = ref<number | null>(null);
+
+    // Artwork prefetch
+    const prefetchDone = ref(0);
+    const prefetchTotal = ref(0);
 
 
     // Actions /////////////////////////////////////////
@@ -66,14 +72,23 @@ export const useUiStore = defineStore('ui', () => {
     }
 
     // Backup
-    function setBackupProgress(percent: number){
+    function setBackupProgress(percent: number, stats?: BackupProgressStats){
         isBackupRunning.value = true;
         backupProgress.value = percent;
+        backupSpeed.value = stats?.speed ?? null;
+        backupEta.value = stats?.eta ?? null;
     }
 
     function finishBackup() {
         isBackupRunning.value = false;
         backupProgress.value = 0;
+        backupSpeed.value = null;
+        backupEta.value = null;
+    }
+
+    function setPrefetchProgress(done: number, total: number) {
+        prefetchDone.value = done;
+        prefetchTotal.value = total;
     }
 
     // Window Managment
@@ -160,8 +175,14 @@ export const useUiStore = defineStore('ui', () => {
         // Backup
         isBackupRunning,
         backupProgress,
+        backupSpeed,
+        backupEta,
         setBackupProgress,
         finishBackup,
+        // Prefetch
+        prefetchDone,
+        prefetchTotal,
+        setPrefetchProgress,
         // Update
         checkUpdates,
         startUpdate,
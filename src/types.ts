@@ -6,6 +6,8 @@ export interface Game {
     save_paths: string[];
     source: 'steam' | 'local';
     local_icon?: string | null;
+    install_size?: number | null;
+    last_updated?: number | null;
 }
 
 export interface GameNewsItem {
@@ -25,6 +27,14 @@ export interface Backup {
     path: string;
 }
 
+export interface BackupProgressStats {
+    percent: number;
+    bytes_done: number;
+    bytes_total: number;
+    speed: string;
+    eta: number | null;
+}
+
 export interface DashboardData {
     user_name: string;
     total_games: number;
@@ -34,6 +44,7 @@ export interface DashboardData {
         id: string;
         steam_id?: string;
         name: string;
+        thumb?: string | null;
     }>;
 }
 
@@ -46,6 +57,8 @@ export interface UpdateInfo {
     update_available: boolean;
     latest_version?: string;
     download_url?: string;
+    sha256?: string | null;
+    size?: number | null;
     changelog?: string;
     error?: string;
     is_network_error?: boolean;
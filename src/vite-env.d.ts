@@ -14,6 +14,7 @@ interface PyWebViewApi {
 
     // Games
     get_games(): Promise<any[]>;
+    stream_games(force?: boolean): Promise<any[]>;
     get_dashboard_data(): Promise<any>;
     get_game_details(gameId: string): Promise<any>;
     get_game_assets(gameId: string, steamId: string | null): Promise<{ hero: string | null, logo: string | null }>;
@@ -24,6 +25,7 @@ interface PyWebViewApi {
     stop_game(): Promise<void>;
     start_backup(gameId: string): Promise<any>;
     delete_backup(filePath: string): Promise<boolean>;
+    restore_backup(filePath: string, gameId: string | null): Promise<any>;
 
     // FileSystem
     open_folder(path: string): Promise<boolean>;
@@ -42,8 +44,12 @@ interface Window {
         togglePlayButton: (isRunning: boolean) => void;
         updateDownloadProgress: (percent: number) => void;
         resetUpdateUI: (errorMessage: string) => void;
-        updateUIProgress: (percent: number) => void;
+        updateUIProgress: (percent: number, stats?: import('./types').BackupProgressStats) => void;
         onBackupComplete: (result: string) => void;
         updateGameAsset: (gameId: string, type: 'hero' | 'logo', data: string) => void;
+        addGames: (games: any[]) => void;
+        finishGamesStream: (gameIds: string[]) => void;
+        updatePrefetchProgress: (done: number, total: number) => void;
+        updateGameNews: (steamId: string, news: import('./types').GameNewsItem[]) => void;
     };
 }
\ No newline at end of file
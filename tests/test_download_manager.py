@@ -0,0 +1,74 @@
+import threading
+import time
+
+from conftest import png_bytes, send_bytes
+from core.cache_service import CacheService
+from core.download_manager import DownloadManager
+
+
+def test_duplicate_submits_share_one_download(http_server):
+    release = threading.Event()
+
+    def logo(request):
+        release.wait(5)
+        send_bytes(request, png_bytes())
+
+    http_server.routes["/logo.png"] = logo
+    cache = CacheService()
+    manager = DownloadManager(cache.save_from_url, workers=2)
+
+    first = manager.submit("logo", "1", http_server.url("/logo.png"))
+    second = manager.submit("logo", "1", http_server.url("/logo.png"), DownloadManager.PRIORITY_PREFETCH)
+    release.set()
+
+    assert first is second
+    assert first.result(5) is True
+    assert http_server.hits("/logo.png") == 1
+    assert cache.has_cached("logo", "1")
+
+
+def test_visible_requests_jump_the_prefetch_queue(http_server):
+    release = threading.Event()
+    order = []
+
+    def blocker(request):
+        release.wait(5)
+        send_bytes(request, png_bytes())
+
+    def recorder(name):
+        def handler(request):
+            order.append(name)
+            send_bytes(request, png_bytes())
+        return handler
+
+    http_server.routes["/blocker.png"] = blocker
+    http_server.routes["/prefetch.png"] = recorder("prefetch")
+    http_server.routes["/visible.png"] = recorder("visible")
+
+    cache = CacheService()
+    manager = DownloadManager(cache.save_from_url, workers=1)
+
+    # occupy the only worker, then queue a prefetch before a visible request
+    busy = manager.submit("logo", "busy", http_server.url("/blocker.png"))
+    while not busy.running():
+        time.sleep(0.01)
+    prefetch = manager.submit("logo", "a", http_server.url("/prefetch.png"), DownloadManager.PRIORITY_PREFETCH)
+    visible = manager.submit("logo", "b", http_server.url("/visible.png"), DownloadManager.PRIORITY_VISIBLE)
+    release.set()
+
+    assert prefetch.result(5) and visible.result(5)
+    assert order == ["visible", "prefetch"]
+
+
+def test_missing_artwork_is_remembered(http_server):
+    cache = CacheService()
+    manager = DownloadManager(cache.save_from_url, workers=1)
+    url = http_server.url("/gone.png")
+
+    assert manager.submit("logo", "1", url).result(5) is False
+    assert cache.is_known_missing(url)
+
+    # a second attempt doesn't go back to the server
+    assert manager.submit("logo", "1", url).result(5) is False
+    assert http_server.hits("/gone.png") == 1
+    assert not cache.has_cached("logo", "1")
@@ -0,0 +1,39 @@
+from core.event_channel import EventChannel
+
+
+class Window:
+    # rejects any payload containing a broken script, the way a JS parse error would
+    def __init__(self):
+        self.evaluated = []
+
+    def evaluate_js(self, script):
+        if "BROKEN" in script:
+            raise RuntimeError("SyntaxError: missing ) after argument list")
+        self.evaluated.append(script)
+
+
+def test_coalesced_events_keep_the_latest():
+    channel = EventChannel()
+    window = Window()
+    channel._window = window
+
+    channel.emit("UI.updateUIProgress(10)", key="backup_progress")
+    channel.emit("UI.updateUIProgress(20)", key="backup_progress")
+    channel.flush()
+
+    assert len(window.evaluated) == 1
+    assert "UI.updateUIProgress(20)" in window.evaluated[0]
+    assert "UI.updateUIProgress(10)" not in window.evaluated[0]
+
+
+def test_a_broken_script_only_loses_itself():
+    channel = EventChannel()
+    window = Window()
+    channel._window = window
+
+    channel.emit("UI.updateUIProgress(50)", key="backup_progress")
+    channel.emit("UI.onBackupComplete('BROKEN')")
+    channel.emit("UI.togglePlayButton(true)")
+    channel.flush()
+
+    assert window.evaluated == ["UI.updateUIProgress(50)", "UI.togglePlayButton(true)"]
@@ -0,0 +1,95 @@
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+from core.config import ConfigService
+from core.library_service import LibraryService
+from core.resolver import PathResolver
+from core.scanner import GameScanner
+from core.steam import SteamService
+
+
+def make_db(path, games):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE games (steam_id TEXT, install_folder TEXT, title TEXT, save_location TEXT)")
+        conn.executemany("INSERT INTO games VALUES (?, ?, ?, ?)", [
+            (steam_id, folder, folder, json.dumps({"win": ["{{p|steam}}/userdata/{{p|uid}}/" + folder]}))
+            for steam_id, folder in games
+        ])
+
+
+def install(root, folder):
+    game = root / folder
+    game.mkdir(parents=True)
+    (game / "game.exe").write_bytes(b"MZ")
+
+
+@pytest.fixture
+def setup(app_dirs, monkeypatch):
+    # os.getlogin needs a controlling terminal, which test runners often lack
+    monkeypatch.setattr(os, "getlogin", lambda: "player")
+    make_db(app_dirs / "database.db", [("1", "Fast Game"), ("2", "Slow Game")])
+
+    fast, slow = app_dirs / "fast", app_dirs / "slow"
+    install(fast, "Fast Game")
+    install(slow, "Slow Game")
+
+    config = ConfigService()
+    config.set("non_steam_paths", [str(fast), str(slow)])
+    config.set("scan_root_timeout", 1)
+
+    def make_library():
+        steam = SteamService(app_dirs / "steam")
+        return LibraryService(GameScanner(steam, config, PathResolver(steam)))
+
+    return make_library, slow
+
+
+def names(games):
+    return sorted(g["name"] for g in games)
+
+
+def test_a_stuck_root_times_out_and_keeps_its_games(setup, monkeypatch):
+    make_library, slow = setup
+    library = make_library()
+    assert names(library.refresh()) == ["Fast Game", "Slow Game"]
+
+    # the slow share now takes longer to list than the per-root timeout
+    fingerprint = LibraryService._root_fingerprint
+    def stalled(root, source):
+        if root == slow: time.sleep(3)
+        return fingerprint(root, source)
+    monkeypatch.setattr(LibraryService, "_root_fingerprint", staticmethod(stalled))
+
+    start = time.monotonic()
+    games = library.refresh(force=True)
+    assert time.monotonic() - start < 2.5
+
+    assert names(games) == ["Fast Game", "Slow Game"]
+    key = LibraryService._root_key(slow, "local")
+    # no fingerprint, so the next refresh looks at the root again
+    assert library._roots[key]["fingerprint"] is None
+
+
+def login(steam_dir, uid, account):
+    (steam_dir / "config").mkdir(parents=True, exist_ok=True)
+    (steam_dir / "config" / "loginusers.vdf").write_text(
+        f'"users"\n{{\n\t"{uid}"\n\t{{\n\t\t"AccountName"\t"{account}"\n\t\t"MostRecent"\t"1"\n\t}}\n}}\n',
+        encoding="utf-8")
+
+
+def test_snapshot_is_dropped_when_the_steam_account_changes(setup, app_dirs):
+    make_library, _ = setup
+    login(app_dirs / "steam", 76561197960265729, "alice")
+    library = make_library()
+    library.refresh()
+    assert library.get_game("1")["save_paths"][0].endswith(os.path.join("userdata", "1", "fast game"))
+
+    # restart as someone else: the old account's save folders must not be used
+    login(app_dirs / "steam", 76561197960265730, "bob")
+    library = make_library()
+    assert library.get_cached_games() == []
+    assert library.get_game("1")["save_paths"][0].endswith(os.path.join("userdata", "2", "fast game"))
@@ -0,0 +1,59 @@
+import time
+
+from conftest import png_bytes, send_bytes
+from core.cache_service import CacheService
+from core.download_manager import DownloadManager
+from core.prefetch_service import PrefetchService
+
+
+class Artwork:
+    # stands in for SteamService, which only builds the CDN urls here
+    def __init__(self, http_server):
+        self.http_server = http_server
+
+    def get_hero_url(self, steam_id):
+        return self.http_server.url(f"/{steam_id}/hero.jpg")
+
+    def get_logo_url(self, steam_id):
+        return self.http_server.url(f"/{steam_id}/logo.png")
+
+
+def make_prefetch(http_server):
+    cache = CacheService()
+    downloads = DownloadManager(cache.save_from_url, workers=2)
+    return cache, PrefetchService(cache, Artwork(http_server), downloads, rate=100)
+
+
+def test_missing_artwork_is_retried_after_it_expires(http_server):
+    games = [{"id": "7", "steam_id": "70"}]
+    cache, prefetch = make_prefetch(http_server)
+
+    prefetch._run(games, lambda *_: None)
+    until = prefetch._done["7"]
+    assert until > time.time()
+    assert http_server.hits("/70/logo.png") == 1
+
+    # still settled after a restart, so nothing is requested
+    cache, prefetch = make_prefetch(http_server)
+    prefetch._run(games, lambda *_: None)
+    assert http_server.hits("/70/logo.png") == 1
+
+    # the logo shows up on the CDN and the missing entries run out
+    http_server.routes["/70/hero.jpg"] = lambda request: send_bytes(request, png_bytes())
+    http_server.routes["/70/logo.png"] = lambda request: send_bytes(request, png_bytes())
+    for url in list(cache._missing):
+        cache._missing[url] = time.time() - 1
+    prefetch._done["7"] = time.time() - 1
+
+    prefetch._run(games, lambda *_: None)
+    assert http_server.hits("/70/logo.png") == 2
+    assert cache.has_cached("logo", "7") and cache.has_cached("hero", "7")
+    assert prefetch._done["7"] == 0
+
+
+def test_old_state_files_are_checked_again(http_server):
+    cache, prefetch = make_prefetch(http_server)
+    prefetch._state_path.write_text('{"done": ["7"]}', encoding="utf-8")
+
+    _, prefetch = make_prefetch(http_server)
+    assert prefetch._done == {}
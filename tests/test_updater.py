@@ -0,0 +1,114 @@
+import hashlib
+import os
+import re
+import socket
+
+import pytest
+
+from conftest import send_bytes
+from core.updater import UpdaterService
+
+DATA = os.urandom(300 * 1024 + 17)
+SHA = hashlib.sha256(DATA).hexdigest()
+
+
+def serve_installer(http_server, ranges: bool = True, cut_after: dict = None):
+    # cut_after: {"limit": n} drops the connection after n body bytes of every response
+    def handler(request):
+        header = request.headers.get("Range")
+        if not ranges or not header:
+            body, status, headers = DATA, 200, {}
+        else:
+            match = re.match(r"bytes=(\d+)-(\d*)", header)
+            start = int(match[1])
+            end = int(match[2]) if match[2] else len(DATA) - 1
+            body, status = DATA[start:end + 1], 206
+            headers = {"Content-Range": f"bytes {start}-{end}/{len(DATA)}"}
+
+        limit = cut_after and cut_after.get("limit")
+        if limit and len(body) > limit:
+            request.send_response(status)
+            for key, value in headers.items():
+                request.send_header(key, value)
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            request.wfile.write(body[:limit])
+            request.wfile.flush()
+            request.close_connection = True
+            request.connection.shutdown(socket.SHUT_RDWR)
+            return
+        send_bytes(request, body, status, headers)
+
+    http_server.routes["/setup.exe"] = handler
+    return http_server.url("/setup.exe")
+
+
+@pytest.fixture(autouse=True)
+def small_segments(monkeypatch):
+    monkeypatch.setattr(UpdaterService, "MIN_SEGMENT", 64 * 1024)
+    monkeypatch.setattr(UpdaterService, "TIMEOUT", (2, 2))
+
+
+def range_requests(http_server):
+    return [h.get("Range") for p, h in http_server.requests if p == "/setup.exe"]
+
+
+def test_parallel_ranges_are_joined_and_verified(http_server, tmp_path):
+    url = serve_installer(http_server)
+    target = tmp_path / "GameVault_Setup.exe"
+    progress = []
+
+    UpdaterService.download_installer(url, target, progress.append, SHA, len(DATA))
+
+    assert target.read_bytes() == DATA
+    # probe plus one request per segment
+    assert len(range_requests(http_server)) == 1 + UpdaterService.DOWNLOAD_WORKERS
+    assert progress[-1] == 100.0
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def test_interrupted_download_resumes_where_it_stopped(http_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(UpdaterService, "RETRIES", 1)
+    # a chunk cut short is lost with the connection, so keep chunks well below the cut
+    monkeypatch.setattr(UpdaterService, "CHUNK_SIZE", 1024)
+    cut = {"limit": 10 * 1024}
+    url = serve_installer(http_server, cut_after=cut)
+    target = tmp_path / "GameVault_Setup.exe"
+
+    with pytest.raises(Exception):
+        UpdaterService.download_installer(url, target, lambda p: None, SHA, len(DATA), workers=1)
+    assert not target.exists()
+    part = next(tmp_path.glob("*.part"))
+    have = part.stat().st_size
+    assert 0 < have <= 10 * 1024
+
+    cut["limit"] = None
+    http_server.requests.clear()
+    UpdaterService.download_installer(url, target, lambda p: None, SHA, len(DATA), workers=1)
+
+    assert target.read_bytes() == DATA
+    assert range_requests(http_server)[-1] == f"bytes={have}-{len(DATA) - 1}"
+
+
+def test_checksum_mismatch_leaves_nothing_behind(http_server, tmp_path):
+    url = serve_installer(http_server)
+    target = tmp_path / "GameVault_Setup.exe"
+    target.write_bytes(b"previous installer")
+
+    with pytest.raises(IOError):
+        UpdaterService.download_installer(url, target, lambda p: None, "00" * 32, len(DATA))
+
+    # the old file is untouched and the bad parts are not kept for a resume
+    assert target.read_bytes() == b"previous installer"
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def test_server_without_range_support(http_server, tmp_path):
+    url = serve_installer(http_server, ranges=False)
+    target = tmp_path / "GameVault_Setup.exe"
+
+    UpdaterService.download_installer(url, target, lambda p: None, SHA, len(DATA))
+
+    assert target.read_bytes() == DATA
+    # probe, then a single plain download
+    assert len(range_requests(http_server)) == 2